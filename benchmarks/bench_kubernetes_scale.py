@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Kubernetes simulator scale benchmark
+Measures per-cycle cost of KubernetesSimulator.simulate_operations at 1k/10k/100k pods
+
+Usage: python benchmarks/bench_kubernetes_scale.py [--cycles N] [--engine numpy|python]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from simulators.kubernetes_simulator import KubernetesSimulator
+
+# Target pod count -> (nodes, namespaces, deployments per namespace, replicas per deployment)
+CLUSTER_SHAPES = {
+    1_000: (50, 10, 20, 5),
+    10_000: (500, 20, 50, 10),
+    100_000: (10_000, 40, 100, 25),
+}
+
+
+def bench(pods: int, engine: str, cycles: int):
+    """Return (setup seconds, per-cycle durations in ms) for one cluster shape"""
+    nodes, namespaces, deployments, replicas = CLUSTER_SHAPES[pods]
+    config = Config()
+    config.SIMULATION_ENGINE = engine
+    config.K8S_SCALE_PROFILE = 'large'
+    config.K8S_NODE_COUNT = nodes
+    config.K8S_NAMESPACES = namespaces
+    config.K8S_DEPLOYMENTS_PER_NAMESPACE = deployments
+    config.K8S_REPLICAS_PER_DEPLOYMENT = replicas
+
+    start = time.perf_counter()
+    simulator = KubernetesSimulator(config)
+    setup = time.perf_counter() - start
+
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        simulator.simulate_operations()
+        durations.append((time.perf_counter() - start) * 1000)
+    return setup, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--engine', choices=['numpy', 'python'], default='numpy')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"engine={args.engine} cycles={args.cycles}")
+    print(f"{'pods':>8} {'setup_s':>8} {'p50_ms':>8} {'p95_ms':>8} {'max_ms':>8}")
+    for pods in CLUSTER_SHAPES:
+        setup, durations = bench(pods, args.engine, args.cycles)
+        durations.sort()
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        print(f"{pods:>8} {setup:>8.2f} {statistics.median(durations):>8.2f} {p95:>8.2f} {durations[-1]:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+System collector backend benchmark
+Compares per-call cost of SystemMonitor's psutil and procfs backends
+
+Usage: python benchmarks/bench_system_collectors.py [--iterations N]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from simulators.procfs import procfs_available
+from simulators.system_monitor import SystemMonitor
+
+# SystemMonitor methods whose cost depends on the backend
+METHODS = (
+    'get_cpu_metrics',
+    'get_memory_metrics',
+    'get_disk_metrics',
+    'get_network_interface_metrics',
+    'get_system_info_metrics',
+    'get_metrics',
+)
+
+
+def bench(backend: str, iterations: int):
+    """Return {method: median microseconds per call} for one backend"""
+    config = Config()
+    config.SYSTEM_COLLECTOR_BACKEND = backend
+    monitor = SystemMonitor(config)
+
+    results = {}
+    try:
+        for method_name in METHODS:
+            method = getattr(monitor, method_name)
+            method()  # warm up the rate and CPU snapshots
+            durations = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                method()
+                durations.append((time.perf_counter() - start) * 1_000_000)
+            results[method_name] = statistics.median(durations)
+    finally:
+        monitor.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    if not procfs_available():
+        sys.exit("/proc is not readable here; the procfs backend needs Linux")
+
+    logging.basicConfig(level=logging.ERROR)
+
+    psutil_us = bench('psutil', args.iterations)
+    procfs_us = bench('procfs', args.iterations)
+
+    print(f"iterations={args.iterations} (median per call)")
+    print(f"{'method':<32} {'psutil_us':>10} {'procfs_us':>10} {'speedup':>8}")
+    for method_name in METHODS:
+        speedup = psutil_us[method_name] / procfs_us[method_name] if procfs_us[method_name] else 0
+        print(f"{method_name:<32} {psutil_us[method_name]:>10.1f} {procfs_us[method_name]:>10.1f} {speedup:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Collector executors
+Runs the metric collectors of a cycle serially, on a thread pool or in worker processes
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (collector name, collector class, method returning Dict[str, float])
+CollectorSpec = Tuple[str, type, str]
+
+
+class CollectorResult:
+    """Outcome of running one collector for a cycle"""
+
+    __slots__ = ('name', 'metrics', 'duration_ms', 'status', 'error')
+
+    def __init__(self, name: str, metrics: Optional[Dict[str, float]], duration_ms: float,
+                 status: str = 'ok', error: Optional[str] = None):
+        self.name = name
+        self.metrics = metrics
+        self.duration_ms = duration_ms
+        self.status = status  # ok, timeout, error or skipped
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+
+def _timed_call(func: Callable[[], Dict[str, float]]) -> Tuple[Dict[str, float], float]:
+    """Call a collector and return its metrics with the wall time it took"""
+    start = time.perf_counter()
+    metrics = func()
+    return metrics, (time.perf_counter() - start) * 1000
+
+
+class CollectorExecutor:
+    """Base class for collector executors"""
+
+    def __init__(self, specs: List[CollectorSpec], config, timeout: float):
+        self.specs = list(specs)
+        self.config = config
+        self.timeout = timeout
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _, _ in self.specs]
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, CollectorResult]:
+        """Run the named collectors (all by default) and return their results"""
+        raise NotImplementedError
+
+    def shutdown(self):
+        """Release executor resources"""
+
+
+class SerialCollectorExecutor(CollectorExecutor):
+    """Runs collectors one after another on the calling thread"""
+
+    def __init__(self, specs: List[CollectorSpec], config, timeout: float):
+        super().__init__(specs, config, timeout)
+        self.collectors = {name: getattr(cls(config), method) for name, cls, method in self.specs}
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, CollectorResult]:
+        results = {}
+        for name in self.names if names is None else names:
+            try:
+                metrics, duration_ms = _timed_call(self.collectors[name])
+                results[name] = CollectorResult(name, metrics, duration_ms)
+            except Exception as e:
+                logger.error(f"Collector {name} failed: {e}", exc_info=True)
+                results[name] = CollectorResult(name, None, 0.0, 'error', str(e))
+        return results
+
+    def shutdown(self):
+        _stop_collectors(self.collectors)
+
+
+class ThreadCollectorExecutor(CollectorExecutor):
+    """Fans collectors out to a thread pool and gathers them with a timeout"""
+
+    def __init__(self, specs: List[CollectorSpec], config, timeout: float):
+        super().__init__(specs, config, timeout)
+        self.collectors = {name: getattr(cls(config), method) for name, cls, method in self.specs}
+        self.pool = ThreadPoolExecutor(max_workers=max(len(self.specs), 1),
+                                       thread_name_prefix='collector')
+        self.in_flight = {}
+
+    def _submit(self, name: str):
+        return self.pool.submit(_timed_call, self.collectors[name])
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, CollectorResult]:
+        return _gather(self, self.names if names is None else names)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        _stop_collectors(self.collectors)
+
+
+_process_collector = None
+
+
+def _init_process_collector(cls: type, config, method: str):
+    """Process pool initializer: build the collector once per worker process"""
+    global _process_collector
+    _process_collector = getattr(cls(config), method)
+
+
+def _run_process_collector() -> Tuple[Dict[str, float], float]:
+    return _timed_call(_process_collector)
+
+
+class ProcessCollectorExecutor(CollectorExecutor):
+    """Runs each collector in its own dedicated worker process
+
+    Every collector gets a single-process pool so its simulator state lives
+    in one place across cycles, while collectors still run in parallel.
+    """
+
+    def __init__(self, specs: List[CollectorSpec], config, timeout: float):
+        super().__init__(specs, config, timeout)
+        # Deferred so the serial and thread executors never load multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.pools = {
+            name: ProcessPoolExecutor(max_workers=1, initializer=_init_process_collector,
+                                      initargs=(cls, config, method))
+            for name, cls, method in self.specs
+        }
+        self.in_flight = {}
+
+    def _submit(self, name: str):
+        return self.pools[name].submit(_run_process_collector)
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, CollectorResult]:
+        return _gather(self, self.names if names is None else names)
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _gather(executor, names: List[str]) -> Dict[str, CollectorResult]:
+    """Submit collectors to a pool-backed executor and collect their results"""
+    results = {}
+    futures = {}
+
+    for name in names:
+        previous = executor.in_flight.get(name)
+        if previous is not None and not previous.done():
+            # Still running from an earlier cycle; don't pile up work or race its state
+            logger.warning(f"Collector {name} still running from previous cycle, skipping")
+            results[name] = CollectorResult(name, None, 0.0, 'skipped')
+            continue
+        futures[name] = executor._submit(name)
+        executor.in_flight[name] = futures[name]
+
+    deadline = time.monotonic() + executor.timeout
+    for name, future in futures.items():
+        try:
+            metrics, duration_ms = future.result(timeout=max(0, deadline - time.monotonic()))
+            results[name] = CollectorResult(name, metrics, duration_ms)
+        except FutureTimeoutError:
+            logger.warning(f"Collector {name} timed out after {executor.timeout}s")
+            results[name] = CollectorResult(name, None, executor.timeout * 1000, 'timeout')
+        except Exception as e:
+            logger.error(f"Collector {name} failed: {e}", exc_info=True)
+            results[name] = CollectorResult(name, None, 0.0, 'error', str(e))
+
+    return results
+
+
+def _stop_collectors(collectors: Dict[str, Callable]):
+    """Call stop() on collector instances that hold background resources"""
+    for name, collector in collectors.items():
+        stop = getattr(collector.__self__, 'stop', None)
+        if stop is not None:
+            try:
+                stop()
+            except Exception as e:
+                logger.error(f"Error stopping collector {name}: {e}")
+
+
+EXECUTORS = {
+    'serial': SerialCollectorExecutor,
+    'thread': ThreadCollectorExecutor,
+    'process': ProcessCollectorExecutor,
+}
+
+
+def create_collector_executor(kind: str, specs: List[CollectorSpec], config,
+                              timeout: float) -> CollectorExecutor:
+    """Create the collector executor selected by name"""
+    try:
+        executor_cls = EXECUTORS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown collector executor: {kind}")
+
+    logger.info(f"Using {kind} collector executor for {len(specs)} collectors")
+    return executor_cls(specs, config, timeout)
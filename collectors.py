@@ -0,0 +1,73 @@
+"""
+Collector registry
+Describes every metric collector and imports only the enabled ones
+"""
+
+import importlib
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from collector_executor import CollectorSpec
+
+logger = logging.getLogger(__name__)
+
+
+class CollectorInfo(NamedTuple):
+    """Static description of a collector; nothing is imported until it is loaded"""
+    name: str        # collector name, also the snapshot family
+    prefix: str      # metric name prefix
+    module: str
+    class_name: str
+    method: str      # method returning Dict[str, float]
+
+
+COLLECTORS = (
+    CollectorInfo('kubernetes', 'k8s', 'simulators.kubernetes_simulator', 'KubernetesSimulator',
+                  'simulate_operations'),
+    CollectorInfo('database', 'database', 'simulators.database_simulator', 'DatabaseSimulator',
+                  'simulate_operations'),
+    CollectorInfo('storage', 'storage', 'simulators.storage_simulator', 'StorageSimulator',
+                  'simulate_operations'),
+    CollectorInfo('network', 'network', 'simulators.network_simulator', 'NetworkSimulator',
+                  'simulate_operations'),
+    CollectorInfo('system', 'system', 'simulators.system_monitor', 'SystemMonitor', 'get_metrics'),
+)
+
+
+def metric_prefixes() -> Dict[str, str]:
+    """Metric name prefix per snapshot family, including the worker's own family"""
+    prefixes = {info.name: f"{info.prefix}." for info in COLLECTORS}
+    prefixes['worker'] = 'worker.'
+    return prefixes
+
+
+def enabled_collectors(config) -> List[CollectorInfo]:
+    """Collectors switched on by their ENABLE_* flag"""
+    collector_config = config.get_collector_config()
+    return [info for info in COLLECTORS if collector_config[info.name]['enabled']]
+
+
+def load_collector_class(info: CollectorInfo) -> type:
+    """Import a collector's module and return its class"""
+    return getattr(importlib.import_module(info.module), info.class_name)
+
+
+def load_collector_specs(config, import_times_ms: Optional[Dict[str, float]] = None) -> List[CollectorSpec]:
+    """Import the enabled collectors and return executor specs for them
+
+    If ``import_times_ms`` is given, the time spent importing each
+    collector's module is recorded in it by collector name.
+    """
+    specs = []
+    for info in enabled_collectors(config):
+        start = time.perf_counter()
+        cls = load_collector_class(info)
+        if import_times_ms is not None:
+            import_times_ms[info.name] = (time.perf_counter() - start) * 1000
+        specs.append((info.name, cls, info.method))
+        
+    disabled = [info.name for info in COLLECTORS if info.name not in {name for name, _, _ in specs}]
+    if disabled:
+        logger.info(f"Collectors disabled: {', '.join(disabled)}")
+    return specs
@@ -3,6 +3,7 @@ Configuration management for the telemetry worker
 """
 
 import os
+import re
 import logging
 from typing import Any, Dict
 
@@ -17,9 +18,56 @@ class Config:
         self.NEW_RELIC_APP_NAME = os.getenv('NEW_RELIC_APP_NAME', 'Azure-K8s-Telemetry-Worker')
         self.NEW_RELIC_ENABLED = bool(self.NEW_RELIC_LICENSE_KEY)
         
+        # Metric sinks: comma-separated list of newrelic, jsonl, prometheus, otlp
+        self.METRIC_SINKS = [
+            name.strip().lower()
+            for name in os.getenv('METRIC_SINKS', 'newrelic').split(',')
+            if name.strip()
+        ]
+        self.METRIC_JSONL_PATH = os.getenv('METRIC_JSONL_PATH', 'telemetry_metrics.jsonl')
+        self.PROMETHEUS_TEXTFILE_PATH = os.getenv('PROMETHEUS_TEXTFILE_PATH', 'telemetry_metrics.prom')
+        self.OTLP_ENDPOINT = os.getenv('OTLP_ENDPOINT', 'http://localhost:4318')
+        self.OTLP_TIMEOUT = float(os.getenv('OTLP_TIMEOUT', '5'))  # seconds
+        
+        # Emission queue between collection and sinks
+        self.EMISSION_QUEUE_SIZE = int(os.getenv('EMISSION_QUEUE_SIZE', '100'))
+        self.EMISSION_QUEUE_POLICY = os.getenv('EMISSION_QUEUE_POLICY', 'drop_oldest').lower()  # drop_oldest or block
+        self.EMISSION_QUEUE_BLOCK_TIMEOUT = float(os.getenv('EMISSION_QUEUE_BLOCK_TIMEOUT', '5'))  # seconds
+        
         # Monitoring configuration
         self.MONITORING_INTERVAL = int(os.getenv('MONITORING_INTERVAL', '30'))  # seconds
         self.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+        # Log file with size-based rotation ('' = stdout only)
+        self.LOG_FILE = os.getenv('LOG_FILE', 'telemetry_worker.log')
+        self.LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+        self.LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '3'))
+        self.LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))  # records buffered before dropping
+        self.LOG_JSON_ENCODER = os.getenv('LOG_JSON_ENCODER', 'auto').lower()  # auto, orjson or json
+        # Minimum seconds between socket state scans (0 = every system collection)
+        self.CONNECTION_STATS_INTERVAL = float(os.getenv('CONNECTION_STATS_INTERVAL', '0'))
+        # Full process scan cadence (0 = count processes every cycle, no top-N) and its top-N ranking
+        self.PROCESS_SCAN_INTERVAL = float(os.getenv('PROCESS_SCAN_INTERVAL', '60'))  # seconds
+        self.PROCESS_TOP_N = int(os.getenv('PROCESS_TOP_N', '5'))
+        self.PROCESS_RANK_BY = os.getenv('PROCESS_RANK_BY', 'cpu').lower()  # cpu or memory
+        # Container metrics from the worker's cgroup v2 group (ignored without cgroup v2)
+        self.ENABLE_CGROUP_METRICS = os.getenv('ENABLE_CGROUP_METRICS', 'true').lower() == 'true'
+        self.CGROUP_INCLUDE_SIBLINGS = os.getenv('CGROUP_INCLUDE_SIBLINGS', 'false').lower() == 'true'
+        # System metric source: procfs (Linux, reads /proc directly), psutil, or auto
+        self.SYSTEM_COLLECTOR_BACKEND = os.getenv('SYSTEM_COLLECTOR_BACKEND', 'auto').lower()
+        # Devices left out of the per-disk and per-interface rates (regex on the device name)
+        self.SYSTEM_DEVICE_EXCLUDE = os.getenv('SYSTEM_DEVICE_EXCLUDE', r'^(lo|loop\d+|ram\d+)$')
+        # 0 = compute CPU usage from deltas between cycles; >0 = background sampling thread period
+        self.CPU_SAMPLE_INTERVAL = float(os.getenv('CPU_SAMPLE_INTERVAL', '0'))  # seconds
+        
+        # Embedded health/readiness/metrics HTTP server (port 0 disables it)
+        self.HEALTH_HOST = os.getenv('HEALTH_HOST', '0.0.0.0')
+        self.HEALTH_PORT = int(os.getenv('HEALTH_PORT', '8080'))
+        # Oldest successful cycle /readyz accepts (0 = 3 cycles of the fastest collector plus COLLECTOR_TIMEOUT)
+        self.READINESS_MAX_CYCLE_AGE = float(os.getenv('READINESS_MAX_CYCLE_AGE', '0'))  # seconds
+        
+        # Collector execution
+        self.COLLECTOR_EXECUTOR = os.getenv('COLLECTOR_EXECUTOR', 'thread').lower()  # serial, thread or process
+        self.COLLECTOR_TIMEOUT = float(os.getenv('COLLECTOR_TIMEOUT', '20'))  # seconds
         
         # Simulation parameters
         self.ENABLE_K8S_SIMULATION = os.getenv('ENABLE_K8S_SIMULATION', 'true').lower() == 'true'
@@ -28,6 +76,46 @@ class Config:
         self.ENABLE_NETWORK_SIMULATION = os.getenv('ENABLE_NETWORK_SIMULATION', 'true').lower() == 'true'
         self.ENABLE_SYSTEM_MONITORING = os.getenv('ENABLE_SYSTEM_MONITORING', 'true').lower() == 'true'
         
+        # Per-collector intervals in seconds (0 = MONITORING_INTERVAL)
+        self.K8S_INTERVAL = int(os.getenv('K8S_INTERVAL', '0'))
+        self.DB_INTERVAL = int(os.getenv('DB_INTERVAL', '0'))
+        self.STORAGE_INTERVAL = int(os.getenv('STORAGE_INTERVAL', '0'))
+        self.NETWORK_INTERVAL = int(os.getenv('NETWORK_INTERVAL', '0'))
+        self.SYSTEM_INTERVAL = int(os.getenv('SYSTEM_INTERVAL', '0'))
+        
+        # Sampling engine for the simulators: auto (NumPy when installed), numpy or python
+        self.SIMULATION_ENGINE = os.getenv('SIMULATION_ENGINE', 'auto').lower()
+        
+        # Queries simulated per cycle (0 = 10-100 queries, the historical default)
+        self.DB_QUERIES_PER_CYCLE = int(os.getenv('DB_QUERIES_PER_CYCLE', '0'))
+        
+        # Blob operations simulated per cycle (0 = 10-50 uploads / 20-100 downloads)
+        self.STORAGE_UPLOADS_PER_CYCLE = int(os.getenv('STORAGE_UPLOADS_PER_CYCLE', '0'))
+        self.STORAGE_DOWNLOADS_PER_CYCLE = int(os.getenv('STORAGE_DOWNLOADS_PER_CYCLE', '0'))
+        
+        # Latency samples per endpoint (0 = 10-30) and extra synthetic endpoints
+        self.NETWORK_SAMPLES_PER_ENDPOINT = int(os.getenv('NETWORK_SAMPLES_PER_ENDPOINT', '0'))
+        self.NETWORK_SYNTHETIC_ENDPOINTS = int(os.getenv('NETWORK_SYNTHETIC_ENDPOINTS', '0'))
+        
+        # Kubernetes cluster shape: baseline (hand-written 23 pods) or small/medium/large generated clusters
+        self.K8S_SCALE_PROFILE = os.getenv('K8S_SCALE_PROFILE', 'baseline').lower()
+        # Optional overrides of the profile's shape (0 = profile default)
+        self.K8S_NODE_COUNT = int(os.getenv('K8S_NODE_COUNT', '0'))
+        self.K8S_NAMESPACES = int(os.getenv('K8S_NAMESPACES', '0'))
+        self.K8S_DEPLOYMENTS_PER_NAMESPACE = int(os.getenv('K8S_DEPLOYMENTS_PER_NAMESPACE', '0'))
+        self.K8S_REPLICAS_PER_DEPLOYMENT = int(os.getenv('K8S_REPLICAS_PER_DEPLOYMENT', '0'))
+        
+        # Kubernetes pod store bounds
+        self.K8S_MAX_PODS = int(os.getenv('K8S_MAX_PODS', '5000'))
+        self.K8S_TERMINATED_POD_TTL = float(os.getenv('K8S_TERMINATED_POD_TTL', '300'))  # seconds
+        
+        # Per-namespace and per-pod series, bounded by a series budget per cycle
+        self.K8S_NAMESPACE_METRICS = os.getenv('K8S_NAMESPACE_METRICS', 'false').lower() == 'true'
+        self.K8S_POD_METRICS = os.getenv('K8S_POD_METRICS', 'false').lower() == 'true'
+        self.K8S_POD_METRICS_TOP_K = int(os.getenv('K8S_POD_METRICS_TOP_K', '20'))
+        self.K8S_POD_METRICS_RANK_BY = os.getenv('K8S_POD_METRICS_RANK_BY', 'cpu').lower()  # cpu, memory or restarts
+        self.K8S_SERIES_BUDGET = int(os.getenv('K8S_SERIES_BUDGET', '500'))
+        
         # Simulation variance settings
         self.ERROR_RATE_VARIANCE = float(os.getenv('ERROR_RATE_VARIANCE', '0.05'))  # 5% variance
         self.PERFORMANCE_VARIANCE = float(os.getenv('PERFORMANCE_VARIANCE', '0.2'))  # 20% variance
@@ -57,6 +145,98 @@ class Config:
         if self.MONITORING_INTERVAL < 1:
             errors.append("MONITORING_INTERVAL must be at least 1 second")
             
+        if min(self.K8S_INTERVAL, self.DB_INTERVAL, self.STORAGE_INTERVAL, self.NETWORK_INTERVAL,
+               self.SYSTEM_INTERVAL) < 0:
+            errors.append("K8S_INTERVAL, DB_INTERVAL, STORAGE_INTERVAL, NETWORK_INTERVAL and "
+                          "SYSTEM_INTERVAL must not be negative")
+            
+        if self.CONNECTION_STATS_INTERVAL < 0:
+            errors.append("CONNECTION_STATS_INTERVAL must not be negative")
+            
+        if self.PROCESS_SCAN_INTERVAL < 0:
+            errors.append("PROCESS_SCAN_INTERVAL must not be negative")
+            
+        if self.PROCESS_TOP_N < 0:
+            errors.append("PROCESS_TOP_N must not be negative")
+            
+        if self.PROCESS_RANK_BY not in ('cpu', 'memory'):
+            errors.append("PROCESS_RANK_BY must be one of: cpu, memory")
+            
+        if self.SYSTEM_COLLECTOR_BACKEND not in ('auto', 'procfs', 'psutil'):
+            errors.append("SYSTEM_COLLECTOR_BACKEND must be one of: auto, procfs, psutil")
+            
+        try:
+            re.compile(self.SYSTEM_DEVICE_EXCLUDE)
+        except re.error as e:
+            errors.append(f"SYSTEM_DEVICE_EXCLUDE is not a valid regular expression: {e}")
+            
+        if self.CPU_SAMPLE_INTERVAL < 0:
+            errors.append("CPU_SAMPLE_INTERVAL must not be negative")
+            
+        if not 0 <= self.HEALTH_PORT <= 65535:
+            errors.append("HEALTH_PORT must be between 0 and 65535")
+            
+        if self.READINESS_MAX_CYCLE_AGE < 0:
+            errors.append("READINESS_MAX_CYCLE_AGE must not be negative")
+            
+        valid_executors = ['serial', 'thread', 'process']
+        if self.COLLECTOR_EXECUTOR not in valid_executors:
+            errors.append(f"COLLECTOR_EXECUTOR must be one of: {', '.join(valid_executors)}")
+            
+        if self.COLLECTOR_TIMEOUT <= 0:
+            errors.append("COLLECTOR_TIMEOUT must be positive")
+            
+        valid_sinks = ['newrelic', 'jsonl', 'prometheus', 'otlp']
+        for sink in self.METRIC_SINKS:
+            if sink not in valid_sinks:
+                errors.append(f"METRIC_SINKS entries must be one of: {', '.join(valid_sinks)}")
+                break
+                
+        if self.EMISSION_QUEUE_SIZE < 1:
+            errors.append("EMISSION_QUEUE_SIZE must be at least 1")
+            
+        if self.EMISSION_QUEUE_BLOCK_TIMEOUT < 0:
+            errors.append("EMISSION_QUEUE_BLOCK_TIMEOUT must not be negative")
+            
+        valid_policies = ['drop_oldest', 'block']
+        if self.EMISSION_QUEUE_POLICY not in valid_policies:
+            errors.append(f"EMISSION_QUEUE_POLICY must be one of: {', '.join(valid_policies)}")
+            
+        valid_engines = ['auto', 'numpy', 'python']
+        if self.SIMULATION_ENGINE not in valid_engines:
+            errors.append(f"SIMULATION_ENGINE must be one of: {', '.join(valid_engines)}")
+            
+        if self.DB_QUERIES_PER_CYCLE < 0:
+            errors.append("DB_QUERIES_PER_CYCLE must not be negative")
+            
+        if self.STORAGE_UPLOADS_PER_CYCLE < 0 or self.STORAGE_DOWNLOADS_PER_CYCLE < 0:
+            errors.append("STORAGE_UPLOADS_PER_CYCLE and STORAGE_DOWNLOADS_PER_CYCLE must not be negative")
+            
+        if self.NETWORK_SAMPLES_PER_ENDPOINT < 0 or self.NETWORK_SYNTHETIC_ENDPOINTS < 0:
+            errors.append("NETWORK_SAMPLES_PER_ENDPOINT and NETWORK_SYNTHETIC_ENDPOINTS must not be negative")
+            
+        valid_profiles = ['baseline', 'small', 'medium', 'large']
+        if self.K8S_SCALE_PROFILE not in valid_profiles:
+            errors.append(f"K8S_SCALE_PROFILE must be one of: {', '.join(valid_profiles)}")
+            
+        if min(self.K8S_NODE_COUNT, self.K8S_NAMESPACES, self.K8S_DEPLOYMENTS_PER_NAMESPACE,
+               self.K8S_REPLICAS_PER_DEPLOYMENT) < 0:
+            errors.append("K8S_NODE_COUNT, K8S_NAMESPACES, K8S_DEPLOYMENTS_PER_NAMESPACE and "
+                          "K8S_REPLICAS_PER_DEPLOYMENT must not be negative")
+            
+        if self.K8S_MAX_PODS < 1:
+            errors.append("K8S_MAX_PODS must be at least 1")
+            
+        if self.K8S_TERMINATED_POD_TTL < 0:
+            errors.append("K8S_TERMINATED_POD_TTL must not be negative")
+            
+        if self.K8S_POD_METRICS_TOP_K < 0 or self.K8S_SERIES_BUDGET < 0:
+            errors.append("K8S_POD_METRICS_TOP_K and K8S_SERIES_BUDGET must not be negative")
+            
+        valid_rank_columns = ['cpu', 'memory', 'restarts']
+        if self.K8S_POD_METRICS_RANK_BY not in valid_rank_columns:
+            errors.append(f"K8S_POD_METRICS_RANK_BY must be one of: {', '.join(valid_rank_columns)}")
+            
         # Validate variance settings
         if not 0 <= self.ERROR_RATE_VARIANCE <= 1:
             errors.append("ERROR_RATE_VARIANCE must be between 0 and 1")
@@ -69,8 +249,18 @@ class Config:
         if self.LOG_LEVEL not in valid_log_levels:
             errors.append(f"LOG_LEVEL must be one of: {', '.join(valid_log_levels)}")
             
+        if self.LOG_MAX_BYTES < 0 or self.LOG_BACKUP_COUNT < 0:
+            errors.append("LOG_MAX_BYTES and LOG_BACKUP_COUNT must not be negative")
+            
+        if self.LOG_QUEUE_SIZE < 1:
+            errors.append("LOG_QUEUE_SIZE must be at least 1")
+            
+        valid_encoders = ['auto', 'orjson', 'json']
+        if self.LOG_JSON_ENCODER not in valid_encoders:
+            errors.append(f"LOG_JSON_ENCODER must be one of: {', '.join(valid_encoders)}")
+            
         # New Relic warnings
-        if not self.NEW_RELIC_ENABLED:
+        if 'newrelic' in self.METRIC_SINKS and not self.NEW_RELIC_ENABLED:
             logger.warning("New Relic integration disabled - no license key provided")
             
         if errors:
@@ -92,6 +282,41 @@ class Config:
             'performance_variance': self.PERFORMANCE_VARIANCE
         }
         
+    def get_collector_config(self) -> Dict[str, Dict[str, Any]]:
+        """Get enable flag and interval per collector"""
+        def interval(value: int) -> int:
+            return value or self.MONITORING_INTERVAL
+            
+        return {
+            'kubernetes': {
+                'enabled': self.ENABLE_K8S_SIMULATION,
+                'interval': interval(self.K8S_INTERVAL)
+            },
+            'database': {
+                'enabled': self.ENABLE_DB_SIMULATION,
+                'interval': interval(self.DB_INTERVAL)
+            },
+            'storage': {
+                'enabled': self.ENABLE_STORAGE_SIMULATION,
+                'interval': interval(self.STORAGE_INTERVAL)
+            },
+            'network': {
+                'enabled': self.ENABLE_NETWORK_SIMULATION,
+                'interval': interval(self.NETWORK_INTERVAL)
+            },
+            'system': {
+                'enabled': self.ENABLE_SYSTEM_MONITORING,
+                'interval': interval(self.SYSTEM_INTERVAL)
+            }
+        }
+        
+    def get_readiness_max_cycle_age(self) -> float:
+        """Seconds since the last successful cycle after which the worker is not ready"""
+        if self.READINESS_MAX_CYCLE_AGE:
+            return self.READINESS_MAX_CYCLE_AGE
+        intervals = [c['interval'] for c in self.get_collector_config().values() if c['enabled']]
+        return 3 * min(intervals, default=self.MONITORING_INTERVAL) + self.COLLECTOR_TIMEOUT
+        
     def get_newrelic_config(self) -> Dict[str, str]:
         """Get New Relic configuration"""
         return {
@@ -109,10 +334,12 @@ Telemetry Worker Configuration:
 - Worker ID: {self.WORKER_ID}
 - Monitoring Interval: {self.MONITORING_INTERVAL}s
 - Log Level: {self.LOG_LEVEL}
+- Collector Executor: {self.COLLECTOR_EXECUTOR}
 - New Relic Enabled: {self.NEW_RELIC_ENABLED}
-- K8s Simulation: {self.ENABLE_K8S_SIMULATION}
-- DB Simulation: {self.ENABLE_DB_SIMULATION}
-- Storage Simulation: {self.ENABLE_STORAGE_SIMULATION}
-- Network Simulation: {self.ENABLE_NETWORK_SIMULATION}
-- System Monitoring: {self.ENABLE_SYSTEM_MONITORING}
+- Metric Sinks: {', '.join(self.METRIC_SINKS)}
+- K8s Simulation: {self.ENABLE_K8S_SIMULATION} (every {self.K8S_INTERVAL or self.MONITORING_INTERVAL}s)
+- DB Simulation: {self.ENABLE_DB_SIMULATION} (every {self.DB_INTERVAL or self.MONITORING_INTERVAL}s)
+- Storage Simulation: {self.ENABLE_STORAGE_SIMULATION} (every {self.STORAGE_INTERVAL or self.MONITORING_INTERVAL}s)
+- Network Simulation: {self.ENABLE_NETWORK_SIMULATION} (every {self.NETWORK_INTERVAL or self.MONITORING_INTERVAL}s)
+- System Monitoring: {self.ENABLE_SYSTEM_MONITORING} (every {self.SYSTEM_INTERVAL or self.MONITORING_INTERVAL}s)
 """
@@ -0,0 +1,133 @@
+"""
+Bounded emission queue
+Decouples metric collection from sink I/O with a dedicated emitter thread
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('drop_oldest', 'block')
+
+
+class EmissionQueue:
+    """Bounded FIFO of emission tasks drained by a background thread
+
+    Each item is a ``(func, args)`` pair called on the emitter thread. When
+    the queue is full, ``drop_oldest`` discards the oldest pending item and
+    ``block`` waits up to ``block_timeout`` seconds for space before dropping
+    the new item, so a slow sink can never stall collection indefinitely.
+    Items put after ``close`` are dropped.
+    """
+
+    def __init__(self, maxsize: int = 100, policy: str = 'drop_oldest', block_timeout: float = 5.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown emission queue policy: {policy}")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.enqueued_total = 0
+        self.emitted_total = 0
+        self.dropped_total = 0
+        self.failed_total = 0
+        self.max_depth = 0
+
+        self._thread = threading.Thread(target=self._drain, name='emitter', daemon=True)
+        self._thread.start()
+        logger.info(f"Emission queue started (size={maxsize}, policy={policy})")
+
+    def put(self, func: Callable, *args: Any) -> bool:
+        """Queue an emission task; returns False if it had to be dropped"""
+        with self._condition:
+            if self._closed:
+                self.dropped_total += 1
+                logger.warning("Emission queue closed, dropping snapshot")
+                return False
+
+            if len(self._items) >= self.maxsize:
+                if self.policy == 'drop_oldest':
+                    self._items.popleft()
+                    self.dropped_total += 1
+                else:
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    if len(self._items) >= self.maxsize or self._closed:
+                        self.dropped_total += 1
+                        logger.warning("Emission queue full, dropping snapshot")
+                        return False
+
+            self._items.append((func, args))
+            self.enqueued_total += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify_all()
+            return True
+
+    def _next(self) -> Optional[Tuple[Callable, tuple]]:
+        with self._condition:
+            while not self._items and not self._closed:
+                self._condition.wait()
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def _drain(self):
+        """Emitter thread loop"""
+        while True:
+            item = self._next()
+            if item is None:
+                break
+
+            func, args = item
+            try:
+                func(*args)
+                self.emitted_total += 1
+            except Exception as e:
+                self.failed_total += 1
+                logger.error(f"Error emitting telemetry: {e}", exc_info=True)
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Queue depth and drop counters for the worker metric family"""
+        return {
+            'emission_queue_depth': self.depth,
+            'emission_queue_max_depth': self.max_depth,
+            'emission_queue_enqueued_total': self.enqueued_total,
+            'emission_queue_emitted_total': self.emitted_total,
+            'emission_queue_dropped_total': self.dropped_total,
+            'emission_queue_failed_total': self.failed_total,
+        }
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting work and wait for pending items to be emitted
+
+        Returns False if the emitter thread is still running after ``timeout``
+        (a sink is stuck), in which case it may still be using the sinks.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Emitter thread still running after {timeout}s, "
+                           f"{len(self._items)} items pending")
+            return False
+        return True
@@ -0,0 +1,90 @@
+"""
+Health server
+Embedded HTTP endpoint for liveness, readiness and Prometheus scrapes
+"""
+
+import json
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """Serves /healthz, /readyz and /metrics from the worker's in-memory state"""
+
+    server_version = 'TelemetryWorker'
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/healthz':
+            self._send_json(*self.server.health.liveness())
+        elif path == '/readyz':
+            self._send_json(*self.server.health.readiness())
+        elif path == '/metrics':
+            self._send(200, self.server.health.render_metrics(), 'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._send_json(404, {'status': 'not found'})
+
+    def _send_json(self, status: int, body: dict):
+        self._send(status, json.dumps(body).encode('utf-8'), 'application/json')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Probes hit these endpoints every few seconds; keep them out of the INFO log
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class HealthServer:
+    """Threaded HTTP server reporting on a running TelemetryWorker
+
+    Liveness only checks that the worker loop is running. Readiness also
+    requires a successful cycle within ``max_cycle_age`` seconds, so a
+    worker whose cycles keep failing or hang is taken out of service.
+    """
+
+    def __init__(self, worker, host: str, port: int, max_cycle_age: float):
+        self.worker = worker
+        self.max_cycle_age = max_cycle_age
+        self.httpd = ThreadingHTTPServer((host, port), HealthRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.health = self
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='health-server', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        host, port = self.httpd.server_address[:2]
+        logger.info(f"Health server listening on {host}:{port}")
+
+    def liveness(self) -> Tuple[int, dict]:
+        if self.worker.running:
+            return 200, {'status': 'ok'}
+        return 503, {'status': 'stopped'}
+
+    def readiness(self) -> Tuple[int, dict]:
+        last_success = self.worker.last_success_time
+        if last_success is None:
+            return 503, {'status': 'starting'}
+
+        age = time.monotonic() - last_success
+        body = {'last_cycle_age_seconds': round(age, 3), 'max_cycle_age_seconds': self.max_cycle_age}
+        if self.worker.running and age <= self.max_cycle_age:
+            return 200, dict(body, status='ready')
+        return 503, dict(body, status='stale')
+
+    def render_metrics(self) -> bytes:
+        # Pre-rendered by the worker each cycle; a scrape only copies the buffer out
+        return self.worker.exposition.body
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
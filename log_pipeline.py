@@ -0,0 +1,137 @@
+"""
+Logging pipeline
+Queue-based, non-blocking log handling with lazy structured encoding and file rotation
+"""
+
+import sys
+import json
+import queue
+import logging
+import logging.handlers
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+JSON_ENCODERS = ('auto', 'orjson', 'json')
+
+# Encoder used by StructuredMessage, chosen by configure_logging
+_encode: Callable[[Any], str] = json.dumps
+
+
+def _orjson_dumps(value: Any) -> str:
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+
+
+def resolve_json_encoder(requested: str) -> Callable[[Any], str]:
+    """Pick the JSON encoder for structured log entries: orjson when requested/available"""
+    if requested == 'json':
+        return json.dumps
+    if orjson is None:
+        if requested == 'orjson':
+            logger.warning("orjson requested for logging but not installed, using json")
+        return json.dumps
+    return _orjson_dumps
+
+
+class StructuredMessage:
+    """Log message that is JSON-encoded only when a handler formats it
+
+    With the queue pipeline that happens on the listener thread, so the
+    caller only pays for creating this wrapper. The encoding is cached, so
+    a record that reaches several handlers is only encoded once.
+    """
+
+    __slots__ = ('data', '_encoded')
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self._encoded = None
+
+    def __str__(self) -> str:
+        if self._encoded is None:
+            self._encoded = _encode(self.data)
+        return self._encoded
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock handler formats every record before queueing it, which would
+    encode structured messages on the logging thread. Records are queued
+    as they are and dropped (and counted) when the queue is full rather than
+    blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped_total = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_total += 1
+
+
+class LogPipeline:
+    """Root logging routed through a bounded queue to stdout and a rotating file"""
+
+    def __init__(self, handler: DeferredQueueHandler, listener: logging.handlers.QueueListener):
+        self.handler = handler
+        self.listener = listener
+
+    def get_metrics(self) -> Dict[str, float]:
+        return {
+            'log_queue_depth': self.handler.queue.qsize(),
+            'log_records_dropped_total': self.handler.dropped_total,
+        }
+
+    def stop(self):
+        """Flush queued records and close the handlers"""
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+def configure_logging(config) -> LogPipeline:
+    """Replace the root handlers with the queue pipeline described by config"""
+    global _encode
+    _encode = resolve_json_encoder(config.LOG_JSON_ENCODER)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if config.LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            config.LOG_FILE,
+            maxBytes=config.LOG_MAX_BYTES,
+            backupCount=config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(config.LOG_QUEUE_SIZE)
+    queue_handler = DeferredQueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(config.LOG_LEVEL)
+    listener.start()
+
+    logger.info(f"Logging to stdout{f' and {config.LOG_FILE}' if config.LOG_FILE else ''} "
+                f"via {'orjson' if _encode is _orjson_dumps else 'json'} encoder")
+    return LogPipeline(queue_handler, listener)
@@ -4,36 +4,60 @@ Azure Kubernetes Infrastructure Telemetry Worker Service
 Main entry point for the telemetry simulation service
 """
 
+import time
+
+# Reference point for the startup breakdown, taken before any other import
+STARTUP_BEGIN = time.perf_counter()
+
 import os
 import sys
 import logging
 import signal
 import threading
-import time
-from dotenv import load_dotenv
-from telemetry_worker import TelemetryWorker
-from config import Config
+from contextlib import contextmanager
+from typing import Dict
 
-# Load environment variables from .env file
-load_dotenv()
+# Heavier modules (dotenv, the worker, its sinks and collectors) are imported in
+# TelemetryService.start so configuration errors surface before paying for them
 
-# Configure logging
+# Bootstrap logging until the configured queue pipeline takes over in start()
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('telemetry_worker.log')
-    ]
+    stream=sys.stdout
 )
 
 logger = logging.getLogger(__name__)
 
+class StartupTimer:
+    """Records how long each startup phase takes"""
+    
+    def __init__(self, begin: float):
+        self.begin = begin
+        self.phases: Dict[str, float] = {}
+        
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+            
+    def get_metrics(self) -> Dict[str, float]:
+        """Per-phase and total startup time in milliseconds"""
+        metrics = {f'startup_{name}_ms': duration_ms for name, duration_ms in self.phases.items()}
+        metrics['startup_total_ms'] = (time.perf_counter() - self.begin) * 1000
+        metrics['startup_modules_loaded'] = len(sys.modules)
+        return metrics
+
 class TelemetryService:
     """Main service class for managing the telemetry worker"""
     
     def __init__(self):
         self.worker = None
+        self.health_server = None
+        self.log_pipeline = None
         self.running = False
         self.shutdown_event = threading.Event()
         
@@ -51,7 +75,12 @@ class TelemetryService:
             logger.info("Stopping telemetry worker...")
             self.worker.stop()
             
+        if self.health_server:
+            self.health_server.stop()
+            
         logger.info("Telemetry service shutdown complete")
+        if self.log_pipeline:
+            self.log_pipeline.stop()
         sys.exit(0)
         
     def start(self):
@@ -62,15 +91,46 @@ class TelemetryService:
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
         
+        startup = StartupTimer(STARTUP_BEGIN)
+        
         try:
-            # Initialize configuration
-            config = Config()
-            config.validate()
-            
-            # Initialize and start telemetry worker
-            self.worker = TelemetryWorker(config)
+            # Load environment variables from .env file
+            with startup.phase('dotenv'):
+                from dotenv import load_dotenv
+                load_dotenv()
+                
+            # Validate configuration before importing anything else
+            with startup.phase('config'):
+                from config import Config
+                config = Config()
+                config.validate()
+                
+            # Non-blocking logging: records are formatted and written on a listener thread
+            with startup.phase('logging'):
+                from log_pipeline import configure_logging
+                self.log_pipeline = configure_logging(config)
+                
+            with startup.phase('worker_import'):
+                from telemetry_worker import TelemetryWorker
+                
+            # Initialize the worker; only enabled sinks and collectors are imported here
+            with startup.phase('worker_init'):
+                self.worker = TelemetryWorker(config, self.log_pipeline)
             self.running = True
             
+            startup_metrics = startup.get_metrics()
+            self.worker.report_startup(startup_metrics)
+            logger.info(f"Startup took {startup_metrics['startup_total_ms']:.0f}ms ("
+                        + ", ".join(f"{name} {duration_ms:.0f}ms" for name, duration_ms in startup.phases.items())
+                        + ")")
+            
+            # Probes and scrapes are answered in-process from the worker's state
+            if config.HEALTH_PORT:
+                from health_server import HealthServer
+                self.health_server = HealthServer(self.worker, config.HEALTH_HOST, config.HEALTH_PORT,
+                                                  config.get_readiness_max_cycle_age())
+                self.health_server.start()
+                
             logger.info("Telemetry worker initialized successfully")
             logger.info(f"Monitoring interval: {config.MONITORING_INTERVAL}s")
             logger.info(f"New Relic enabled: {config.NEW_RELIC_ENABLED}")
@@ -0,0 +1,110 @@
+"""
+Cycle scheduler
+Drift-free, wall-clock aligned cadence for the telemetry collectors
+"""
+
+import math
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CycleScheduler:
+    """Fixed-rate scheduler for collectors with individual intervals
+
+    Cycles fire on a common tick (the GCD of all collector intervals) aligned
+    to wall-clock multiples of that tick, so a 30s tick fires at :00 and :30
+    and a 60s collector always runs on the minute. Deadlines advance by whole
+    ticks on the monotonic clock, so cycle duration and sleep inaccuracy never
+    accumulate into drift. When a cycle overruns one or more ticks, those ticks
+    are skipped instead of being run back to back, and collectors that were
+    due in them run at the next tick.
+    """
+
+    def __init__(self, intervals: Dict[str, float]):
+        # Work in whole milliseconds so the common tick is exact
+        interval_ms = {name: max(1, round(seconds * 1000)) for name, seconds in intervals.items()}
+        self.intervals = intervals
+        self.tick_ms = math.gcd(*interval_ms.values()) if interval_ms else 1000
+        self.tick = self.tick_ms / 1000
+        self._ticks_per_run = {name: ms // self.tick_ms for name, ms in interval_ms.items()}
+
+        self._stop_event = threading.Event()
+        self._tick_number = 0      # wall-clock tick index of the next deadline
+        self._deadline = 0.0       # monotonic time of the next deadline
+        self._next_due: Dict[str, int] = {}
+
+        self.cycles_total = 0
+        self.overruns_total = 0
+        self.skipped_ticks_total = 0
+        self.last_lag_ms = 0.0
+
+    def start(self):
+        """Align the first deadline to the next wall-clock tick boundary"""
+        wall_ms = time.time() * 1000
+        monotonic = time.monotonic()
+        self._tick_number = int(wall_ms // self.tick_ms) + 1
+        self._deadline = monotonic + (self._tick_number * self.tick_ms - wall_ms) / 1000
+        self._next_due = {
+            name: -(-self._tick_number // ticks) * ticks
+            for name, ticks in self._ticks_per_run.items()
+        }
+        logger.info(f"Scheduler started with a {self.tick:g}s tick, first cycle in "
+                    f"{self._deadline - monotonic:.2f}s")
+
+    def _skip_missed_ticks(self):
+        """Drop deadlines that already passed while the previous cycle ran"""
+        missed = math.floor((time.monotonic() - self._deadline) / self.tick) + 1
+        if missed > 0:
+            self.overruns_total += 1
+            self.skipped_ticks_total += missed
+            self._tick_number += missed
+            self._deadline += missed * self.tick
+            logger.warning(f"Cycle overran its schedule, skipped {missed} tick(s)")
+
+    def wait(self) -> Optional[List[str]]:
+        """Sleep until the next tick with due collectors and return their names
+
+        Returns None once ``stop`` has been called.
+        """
+        if not self._next_due:
+            self._stop_event.wait()
+            return None
+        self._skip_missed_ticks()
+
+        # Ticks where nothing is due (e.g. 10s and 15s intervals on a 5s tick) are passed over
+        while True:
+            due = [name for name, tick in self._next_due.items() if tick <= self._tick_number]
+            if due:
+                break
+            self._tick_number += 1
+            self._deadline += self.tick
+
+        if self._stop_event.wait(max(0.0, self._deadline - time.monotonic())):
+            return None
+
+        self.last_lag_ms = (time.monotonic() - self._deadline) * 1000
+        for name in due:
+            ticks = self._ticks_per_run[name]
+            self._next_due[name] = (self._tick_number // ticks + 1) * ticks
+        self._tick_number += 1
+        self._deadline += self.tick
+        self.cycles_total += 1
+        return due
+
+    def stop(self):
+        """Wake a pending ``wait`` and make it return None"""
+        self._stop_event.set()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Cadence and overrun counters for the worker metric family"""
+        return {
+            'scheduler_tick_seconds': self.tick,
+            'scheduler_cycles_total': self.cycles_total,
+            'scheduler_overruns_total': self.overruns_total,
+            'scheduler_skipped_ticks_total': self.skipped_ticks_total,
+            'scheduler_wakeup_lag_ms': self.last_lag_ms,
+        }
@@ -13,6 +13,9 @@ setup(
         "psutil>=7.0.0",
         "python-dotenv>=1.1.0",
     ],
+    extras_require={
+        "fast": ["numpy>=1.26", "orjson>=3.9"],
+    },
     python_requires=">=3.11",
     entry_points={
         "console_scripts": [
@@ -0,0 +1,245 @@
+"""
+cgroup v2 container metrics
+CPU, memory, I/O and PSI pressure for the worker's own cgroup (and optionally its siblings)
+"""
+
+import os
+import re
+import time
+import logging
+from collections import namedtuple
+from typing import Dict, Optional
+
+from simulators.counter_rates import CounterRates
+from simulators.procfs import ProcfsFile
+
+# Sibling group names ("cri-containerd-0a1b.scope") become a level of the metric name
+_INVALID_NAME_CHARS = re.compile(r'[^A-Za-z0-9_]')
+
+logger = logging.getLogger(__name__)
+
+# Unified hierarchy mount points: pure cgroup v2, then the hybrid layout
+CGROUP2_MOUNTS = ('/sys/fs/cgroup', '/sys/fs/cgroup/unified')
+
+PRESSURE_RESOURCES = ('cpu', 'memory', 'io')
+
+CpuStat = namedtuple('CpuStat', 'usage_usec nr_periods nr_throttled throttled_usec')
+IoStat = namedtuple('IoStat', 'rbytes wbytes rios wios')
+
+IO_RATE_METRICS = {
+    'rbytes': 'read_bytes_per_sec',
+    'wbytes': 'write_bytes_per_sec',
+    'rios': 'read_iops',
+    'wios': 'write_iops',
+}
+
+
+def find_own_cgroup(proc_self_cgroup: str = '/proc/self/cgroup') -> Optional[str]:
+    """Directory of this process's cgroup v2 group, or None without a unified hierarchy"""
+    try:
+        with open(proc_self_cgroup) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    # The v2 entry is "0::<path>"; with a cgroup namespace the path is "/"
+    relative = next((line[3:] for line in lines if line.startswith('0::')), None)
+    if relative is None:
+        return None
+
+    for mount in CGROUP2_MOUNTS:
+        path = os.path.join(mount, relative.lstrip('/'))
+        if os.path.exists(os.path.join(path, 'cgroup.controllers')):
+            return os.path.normpath(path)
+    return None
+
+
+def parse_flat_keyed(data: bytes) -> Dict[bytes, int]:
+    """Parse "key value" lines (cpu.stat, memory.stat)"""
+    values = {}
+    for line in data.split(b'\n'):
+        key, _, value = line.partition(b' ')
+        if value:
+            values[bytes(key)] = int(value)
+    return values
+
+
+def parse_cpu_stat(data: bytes) -> CpuStat:
+    values = parse_flat_keyed(data)
+    return CpuStat(*(values.get(field.encode(), 0) for field in CpuStat._fields))
+
+
+def parse_cpu_max(data: bytes) -> Optional[float]:
+    """CPU limit in cores from cpu.max ("<quota> <period>"), None when unlimited"""
+    quota, _, period = bytes(data).strip().partition(b' ')
+    if quota == b'max' or not period:
+        return None
+    return int(quota) / int(period)
+
+
+def parse_memory_value(data: bytes) -> Optional[int]:
+    """memory.current / memory.max value in bytes, None for "max" """
+    value = bytes(data).strip()
+    return None if value == b'max' else int(value)
+
+
+def parse_pressure(data: bytes) -> Dict[str, float]:
+    """Parse a PSI file into {'some_avg10': ..., 'some_total_usec': ..., 'full_avg10': ...}"""
+    values = {}
+    for line in data.split(b'\n'):
+        fields = line.split()
+        if not fields:
+            continue
+        kind = fields[0].decode()
+        for field in fields[1:]:
+            key, _, value = field.partition(b'=')
+            if key == b'total':
+                values[f'{kind}_total_usec'] = int(value)
+            else:
+                values[f'{kind}_{key.decode()}'] = float(value)
+    return values
+
+
+def parse_io_stat(data: bytes) -> IoStat:
+    """Sum the per-device lines of io.stat ("8:0 rbytes=... wbytes=... rios=... wios=...")"""
+    totals = dict.fromkeys(IoStat._fields, 0)
+    for line in data.split(b'\n'):
+        for field in line.split()[1:]:
+            key, _, value = field.partition(b'=')
+            key = key.decode()
+            if key in totals:
+                totals[key] += int(value)
+    return IoStat(**totals)
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class CgroupMonitor:
+    """Container-level metrics from the cgroup v2 interface files
+
+    The worker's own cgroup files are kept open and re-read with pread, like
+    the procfs backend. Files missing from the group (controllers that are
+    not enabled, or the root cgroup) are skipped. Sibling cgroups (other
+    containers or services under the same parent) come and go, so they are
+    opened per collection and only report CPU and memory usage.
+
+    Siblings are only visible without a cgroup namespace. Inside a private
+    cgroup namespace (the default for containers on cgroup v2) the worker's
+    group is the root of what it can see, "0::/", so it has no parent and
+    no siblings are reported.
+    """
+
+    FILES = ('cpu.stat', 'cpu.max', 'memory.current', 'memory.max', 'io.stat',
+             'cpu.pressure', 'memory.pressure', 'io.pressure')
+
+    def __init__(self, path: str, include_siblings: bool = False):
+        self.path = path
+        self.include_siblings = include_siblings
+        self._files: Dict[str, ProcfsFile] = {}
+        for name in self.FILES:
+            try:
+                self._files[name] = ProcfsFile(os.path.join(path, name))
+            except OSError:
+                pass
+
+        self._cpu_rates = CounterRates(('usage_usec', 'nr_periods', 'nr_throttled', 'throttled_usec'))
+        self._io_rates = CounterRates(IO_RATE_METRICS)
+        self._sibling_cpu_rates = CounterRates(('usage_usec',))
+        logger.info(f"cgroup v2 metrics from {path} ({len(self._files)}/{len(self.FILES)} files available)")
+
+    def _read(self, name: str) -> Optional[bytes]:
+        procfs_file = self._files.get(name)
+        return procfs_file.read() if procfs_file else None
+
+    def cpu_limit_cores(self) -> float:
+        """Cores the cgroup may use: its cpu.max quota, else every online CPU"""
+        data = self._read('cpu.max')
+        limit = parse_cpu_max(data) if data else None
+        return limit or float(os.cpu_count() or 1)
+
+    def get_metrics(self) -> Dict[str, float]:
+        metrics = {}
+        now = time.monotonic()
+
+        # CPU usage against the quota, and CFS throttling
+        limit_cores = self.cpu_limit_cores()
+        metrics['cgroup_cpu_limit_cores'] = limit_cores
+        data = self._read('cpu.stat')
+        if data:
+            cpu_stat = parse_cpu_stat(data)
+            metrics['cgroup_cpu_throttled_periods_total'] = cpu_stat.nr_throttled
+            rates = self._cpu_rates.update({'self': cpu_stat}, now).get('self')
+            if rates:
+                usage_cores = rates['usage_usec'] / 1_000_000
+                metrics['cgroup_cpu_usage_cores'] = usage_cores
+                metrics['cgroup_cpu_usage_percent'] = usage_cores / limit_cores * 100
+                metrics['cgroup_cpu_throttled_percent'] = (
+                    rates['nr_throttled'] / rates['nr_periods'] * 100 if rates['nr_periods'] else 0.0
+                )
+                metrics['cgroup_cpu_throttled_seconds_per_sec'] = rates['throttled_usec'] / 1_000_000
+
+        # Memory usage against memory.max
+        data = self._read('memory.current')
+        if data:
+            usage = parse_memory_value(data)
+            metrics['cgroup_memory_usage_bytes'] = usage
+            data = self._read('memory.max')
+            limit = parse_memory_value(data) if data else None
+            if limit:
+                metrics['cgroup_memory_limit_bytes'] = limit
+                metrics['cgroup_memory_usage_percent'] = usage / limit * 100
+
+        # I/O issued by the cgroup, all devices combined
+        data = self._read('io.stat')
+        if data is not None:
+            rates = self._io_rates.update({'self': parse_io_stat(data)}, now).get('self', {})
+            for field, rate in rates.items():
+                metrics[f'cgroup_io_{IO_RATE_METRICS[field]}'] = rate
+
+        # Pressure stall information: share of time tasks were stalled on each resource
+        for resource in PRESSURE_RESOURCES:
+            data = self._read(f'{resource}.pressure')
+            if data:
+                for key, value in parse_pressure(data).items():
+                    if not key.endswith('total_usec'):
+                        metrics[f'cgroup_{resource}_pressure_{key}'] = value
+
+        if self.include_siblings:
+            metrics.update(self._sibling_metrics(now))
+        return metrics
+
+    def _sibling_metrics(self, now: float) -> Dict[str, float]:
+        """CPU and memory usage of the other groups under the same parent (e.g. sibling containers)"""
+        own_name = os.path.basename(self.path)
+        parent = os.path.dirname(self.path)
+        if parent == self.path or not os.path.exists(os.path.join(parent, 'cgroup.controllers')):
+            return {}
+
+        cpu_stats = {}
+        metrics = {}
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False) or entry.name == own_name:
+                    continue
+                name = _INVALID_NAME_CHARS.sub('_', entry.name)
+                data = _read_file(os.path.join(entry.path, 'cpu.stat'))
+                if data:
+                    cpu_stats[name] = parse_cpu_stat(data)
+                data = _read_file(os.path.join(entry.path, 'memory.current'))
+                if data:
+                    metrics[f'cgroup.{name}.memory_usage_bytes'] = parse_memory_value(data)
+
+        for name, rates in self._sibling_cpu_rates.update(cpu_stats, now).items():
+            metrics[f'cgroup.{name}.cpu_usage_cores'] = rates['usage_usec'] / 1_000_000
+        metrics['cgroup_sibling_count'] = len(cpu_stats)
+        return metrics
+
+    def close(self):
+        for procfs_file in self._files.values():
+            procfs_file.close()
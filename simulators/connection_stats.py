@@ -0,0 +1,105 @@
+"""
+Socket connection-state accounting
+Counts TCP/UDP sockets per state from /proc/net with a psutil fallback
+"""
+
+import os
+import re
+import time
+import logging
+from collections import Counter
+from typing import Dict
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Kernel TCP state codes (include/net/tcp_states.h) mapped to psutil's status names
+TCP_STATES = {
+    b'01': psutil.CONN_ESTABLISHED,
+    b'02': psutil.CONN_SYN_SENT,
+    b'03': psutil.CONN_SYN_RECV,
+    b'04': psutil.CONN_FIN_WAIT1,
+    b'05': psutil.CONN_FIN_WAIT2,
+    b'06': psutil.CONN_TIME_WAIT,
+    b'07': psutil.CONN_CLOSE,
+    b'08': psutil.CONN_CLOSE_WAIT,
+    b'09': psutil.CONN_LAST_ACK,
+    b'0A': psutil.CONN_LISTEN,
+    b'0B': psutil.CONN_CLOSING,
+    b'0C': psutil.CONN_SYN_RECV,  # TCP_NEW_SYN_RECV
+}
+
+TCP_TABLES = ('/proc/net/tcp', '/proc/net/tcp6')
+UDP_TABLES = ('/proc/net/udp', '/proc/net/udp6')
+
+# The 'st' column: two hex digits right after the remote address's 4-digit port
+_TCP_STATE_FIELD = re.compile(rb':[0-9A-F]{4} ([0-9A-F]{2}) ')
+
+
+def _read_table(path: str) -> bytes:
+    """Read a /proc/net table in one go; empty if the protocol is unavailable"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return b''
+
+
+def read_proc_net_states() -> Dict[str, int]:
+    """Count sockets per state straight from the kernel's /proc/net tables
+
+    Only the state column is extracted, with one regex pass per table, so
+    no per-connection objects are built and no process fd tables are
+    walked. UDP sockets are reported under psutil's NONE status.
+    """
+    codes = Counter()
+    for path in TCP_TABLES:
+        codes.update(_TCP_STATE_FIELD.findall(_read_table(path)))
+
+    states = Counter()
+    for code, count in codes.items():
+        states[TCP_STATES.get(code, psutil.CONN_NONE)] += count
+
+    # One header line, then one line per socket
+    udp = sum(max(0, _read_table(path).count(b'\n') - 1) for path in UDP_TABLES)
+    if udp:
+        states[psutil.CONN_NONE] += udp
+    return dict(states)
+
+
+def read_psutil_states() -> Dict[str, int]:
+    """Count sockets per state with psutil.net_connections (portable, but walks every process)"""
+    states = Counter(conn.status for conn in psutil.net_connections())
+    return dict(states)
+
+
+class ConnectionStateCounter:
+    """Cached per-state socket counts, refreshed at most every refresh_interval seconds"""
+
+    def __init__(self, refresh_interval: float = 0):
+        self.refresh_interval = refresh_interval
+        self.backend = 'procfs' if os.path.exists(TCP_TABLES[0]) else 'psutil'
+        self._states: Dict[str, int] = {}
+        self._refreshed_at = None
+        self.last_refresh_ms = 0.0
+        logger.info(f"Connection state accounting using {self.backend}")
+
+    def _read(self) -> Dict[str, int]:
+        if self.backend == 'procfs':
+            try:
+                return read_proc_net_states()
+            except OSError as e:
+                logger.warning(f"Reading /proc/net failed ({e}), falling back to psutil")
+                self.backend = 'psutil'
+        return read_psutil_states()
+
+    def get_states(self) -> Dict[str, int]:
+        """Socket count per psutil status name (ESTABLISHED, LISTEN, ..., NONE)"""
+        now = time.monotonic()
+        if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+            start = time.perf_counter()
+            self._states = self._read()
+            self.last_refresh_ms = (time.perf_counter() - start) * 1000
+            self._refreshed_at = now
+        return self._states
@@ -0,0 +1,65 @@
+"""
+Counter rate tracking
+Turns monotonically increasing per-device counters into per-second rates
+"""
+
+import time
+import logging
+from typing import Dict, Iterable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_COUNTER_32_MAX = 2 ** 32
+
+
+def counter_delta(previous: int, current: int) -> int:
+    """Increase of a counter between two readings, allowing for wraps and resets
+
+    A counter that went backwards from below 2**32 is assumed to be a 32-bit
+    counter that wrapped. Anything larger is a 64-bit counter, which does
+    not wrap in practice, so a decrease means the device was reset and the
+    counter restarted from zero.
+    """
+    if current >= previous:
+        return current - previous
+    if previous < _COUNTER_32_MAX:
+        return current + _COUNTER_32_MAX - previous
+    return current
+
+
+class CounterRates:
+    """Per-device rates computed from the previous counter snapshot
+
+    ``update`` takes the latest counters for every device, keyed by device
+    name, and returns per-second rates of the requested fields for the
+    devices that were also present in the previous snapshot. Devices that
+    disappear are forgotten, so a re-added device starts a fresh window.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self._previous: Dict[str, tuple] = {}
+        self._previous_time: Optional[float] = None
+
+    def update(self, counters: Mapping[str, object], now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        now = time.monotonic() if now is None else now
+        current = {
+            device: tuple(getattr(values, field) for field in self.fields)
+            for device, values in counters.items()
+        }
+
+        rates = {}
+        elapsed = None if self._previous_time is None else now - self._previous_time
+        if elapsed is not None and elapsed > 0:
+            for device, values in current.items():
+                previous = self._previous.get(device)
+                if previous is None:
+                    continue
+                rates[device] = {
+                    field: counter_delta(prev, cur) / elapsed
+                    for field, prev, cur in zip(self.fields, previous, values)
+                }
+
+        self._previous = current
+        self._previous_time = now
+        return rates
@@ -0,0 +1,111 @@
+"""
+Non-blocking CPU utilization sampler
+Computes overall and per-core CPU usage from deltas between cpu_times snapshots
+"""
+
+import threading
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+def _busy_and_total(times) -> tuple:
+    """Return (busy, total) seconds for a cpu_times namedtuple"""
+    total = sum(times)
+    # guest and guest_nice are already accounted for in user and nice on Linux
+    total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total - idle, total
+
+
+def _utilization(previous, current) -> float:
+    """Percentage of non-idle time between two cpu_times snapshots"""
+    prev_busy, prev_total = _busy_and_total(previous)
+    busy, total = _busy_and_total(current)
+
+    total_delta = total - prev_total
+    if total_delta <= 0:
+        return 0.0
+
+    busy_delta = busy - prev_busy
+    return max(0.0, min(100.0, (busy_delta / total_delta) * 100))
+
+
+def read_psutil_times() -> Tuple[object, List[object]]:
+    """Aggregate and per-core cpu_times from psutil"""
+    return psutil.cpu_times(), psutil.cpu_times(percpu=True)
+
+
+class CpuSampler:
+    """Tracks CPU utilization without sleeping on the collection path
+
+    With ``interval`` set to 0 the sampler keeps the previous snapshot and
+    reports utilization since the last call to ``sample``. A positive
+    ``interval`` starts a daemon thread that refreshes the figures on that
+    cadence, so readers always get the most recent window.
+
+    ``read_times`` returns the (aggregate, per-core) cpu_times snapshots;
+    it defaults to psutil.
+    """
+
+    def __init__(self, interval: float = 0, read_times: Callable[[], Tuple[object, List[object]]] = read_psutil_times):
+        self.interval = interval
+        self.read_times = read_times
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._last_total, self._last_per_core = read_times()
+        self._cpu_percent = 0.0
+        self._per_core_percent: List[float] = [0.0] * len(self._last_per_core)
+
+        if interval > 0:
+            self._thread = threading.Thread(target=self._run, name='cpu-sampler', daemon=True)
+            self._thread.start()
+            logger.info(f"CPU sampler thread started with {interval}s interval")
+
+    def _refresh(self):
+        """Take a new snapshot and update utilization from the deltas"""
+        current_total, current_per_core = self.read_times()
+
+        with self._lock:
+            self._cpu_percent = _utilization(self._last_total, current_total)
+            if len(current_per_core) == len(self._last_per_core):
+                self._per_core_percent = [
+                    _utilization(prev, cur)
+                    for prev, cur in zip(self._last_per_core, current_per_core)
+                ]
+            else:
+                # CPU hotplug changed the core count; restart the window
+                self._per_core_percent = [0.0] * len(current_per_core)
+            self._last_total = current_total
+            self._last_per_core = current_per_core
+
+    def _run(self):
+        """Background sampling loop"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.error(f"Error sampling CPU times: {e}")
+
+    def sample(self) -> Dict[str, object]:
+        """Return overall and per-core utilization for the latest window"""
+        if self._thread is None:
+            self._refresh()
+
+        with self._lock:
+            return {
+                'cpu_percent': self._cpu_percent,
+                'per_core_percent': list(self._per_core_percent),
+                'cpu_times': self._last_total,
+            }
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background sampling thread if one is running"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
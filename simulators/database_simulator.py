@@ -7,10 +7,37 @@ import random
 import time
 import logging
 import os
+from bisect import bisect_left
 from typing import Dict, List
 
+from simulators.sampling import np, resolve_engine, percentile_metrics
+
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the per-query-type latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class QueryTypeStats:
+    """Running totals and histogram for one query type within a cycle"""
+    
+    __slots__ = ('count', 'total_ms', 'slow', 'buckets')
+    
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slow = 0
+        # One bucket per bound plus an overflow bucket
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        
+    def add(self, exec_time: float, slow: bool):
+        self.count += 1
+        self.total_ms += exec_time
+        if slow:
+            self.slow += 1
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, exec_time)] += 1
+
+
 class DatabaseSimulator:
     """Simulates database operations and performance metrics"""
     
@@ -28,14 +55,8 @@ class DatabaseSimulator:
         self.db_name = os.getenv('PGDATABASE', 'app_db')
         self.db_user = os.getenv('PGUSER', 'app_user')
         
-        logger.info(f"Database simulator initialized for {self.db_host}:{self.db_name}")
-        
-    def simulate_query_performance(self) -> Dict[str, float]:
-        """Simulate database query performance metrics"""
-        metrics = {}
-        
         # Simulate different types of queries with realistic timing
-        query_metrics = {
+        self.query_metrics = {
             'SELECT': {'min': 2, 'max': 50, 'weight': 0.6},
             'INSERT': {'min': 5, 'max': 100, 'weight': 0.15},
             'UPDATE': {'min': 10, 'max': 200, 'weight': 0.1},
@@ -43,37 +64,135 @@ class DatabaseSimulator:
             'JOIN': {'min': 20, 'max': 500, 'weight': 0.08},
             'AGGREGATE': {'min': 50, 'max': 1000, 'weight': 0.02}
         }
+        self.slow_query_probability = 0.05
+        
+        # 0 keeps the historical 10-100 queries per cycle
+        self.queries_per_cycle = config.DB_QUERIES_PER_CYCLE
+        self.engine = resolve_engine(config.SIMULATION_ENGINE)
+        if self.engine == 'numpy':
+            self._rng = np.random.default_rng()
+            self._query_weights = np.array([c['weight'] for c in self.query_metrics.values()])
+            self._query_weights /= self._query_weights.sum()
+            self._query_min = np.array([c['min'] for c in self.query_metrics.values()], dtype=float)
+            self._query_max = np.array([c['max'] for c in self.query_metrics.values()], dtype=float)
+            self._latency_buckets = np.array(LATENCY_BUCKETS_MS, dtype=float)
         
-        total_queries = 0
-        total_time = 0
-        slow_queries = 0
+        logger.info(f"Database simulator initialized for {self.db_host}:{self.db_name} "
+                    f"({self.engine} engine)")
+        
+    def _query_counts(self) -> List[int]:
+        """Number of queries of each type to simulate this cycle"""
+        weights = [c['weight'] for c in self.query_metrics.values()]
+        
+        if self.queries_per_cycle <= 0:
+            return [int(random.uniform(10, 100) * weight) for weight in weights]
+            
+        if self.engine == 'numpy':
+            return self._rng.multinomial(self.queries_per_cycle, self._query_weights).tolist()
+            
+        # Largest remainder: the queries lost to truncation go to the largest fractional shares
+        total_weight = sum(weights)
+        shares = [self.queries_per_cycle * weight / total_weight for weight in weights]
+        counts = [int(share) for share in shares]
+        remainder = self.queries_per_cycle - sum(counts)
+        for i in sorted(range(len(shares)), key=lambda i: shares[i] - counts[i], reverse=True)[:remainder]:
+            counts[i] += 1
+        return counts
+        
+    def simulate_query_performance(self) -> Dict[str, float]:
+        """Simulate database query performance metrics"""
+        query_counts = self._query_counts()
+        
+        if self.engine == 'numpy':
+            return self._simulate_query_performance_numpy(query_counts)
+        return self._simulate_query_performance_python(query_counts)
+        
+    def _simulate_query_performance_numpy(self, query_counts: List[int]) -> Dict[str, float]:
+        """Draw every query latency of the cycle as one array"""
+        rng = self._rng
+        counts = np.array(query_counts)
+        total_queries = int(counts.sum())
+        type_count = len(counts)
+        bucket_count = len(LATENCY_BUCKETS_MS) + 1
+        
+        # Query type of each simulated query, grouped by type
+        type_index = np.repeat(np.arange(type_count), counts)
+        low = self._query_min[type_index]
+        high = self._query_max[type_index]
+        
+        # Query execution time with occasional spikes (max..3*max for slow queries)
+        slow = rng.random(total_queries) < self.slow_query_probability
+        spread = np.where(slow, 2 * high, high - low)
+        start = np.where(slow, high, low)
+        exec_times = start + rng.random(total_queries) * spread
+        
+        # Per-type totals, slow counts and histogram buckets in one pass each
+        type_totals = np.bincount(type_index, weights=exec_times, minlength=type_count)
+        type_slow = np.bincount(type_index, weights=slow, minlength=type_count)
+        bucket_index = np.searchsorted(self._latency_buckets, exec_times, side='left')
+        type_buckets = np.bincount(type_index * bucket_count + bucket_index,
+                                   minlength=type_count * bucket_count).reshape(type_count, bucket_count)
+        
+        stats = []
+        for i in range(type_count):
+            type_stats = QueryTypeStats()
+            type_stats.count = int(counts[i])
+            type_stats.total_ms = float(type_totals[i])
+            type_stats.slow = int(type_slow[i])
+            type_stats.buckets = type_buckets[i].tolist()
+            stats.append(type_stats)
+            
+        return self._query_performance_metrics(stats, exec_times)
+        
+    def _simulate_query_performance_python(self, query_counts: List[int]) -> Dict[str, float]:
+        """Simulate queries one by one with the random module"""
+        stats = []
+        exec_times = []
         
         # Simulate query execution over the monitoring period
-        for query_type, config in query_metrics.items():
-            # Number of queries based on weight
-            query_count = int(random.uniform(10, 100) * config['weight'])
-            total_queries += query_count
+        for config, query_count in zip(self.query_metrics.values(), query_counts):
+            type_stats = QueryTypeStats()
             
             for _ in range(query_count):
                 # Query execution time with occasional spikes
-                if random.random() < 0.05:  # 5% chance of slow query
+                if random.random() < self.slow_query_probability:  # 5% chance of slow query
                     exec_time = random.uniform(config['max'], config['max'] * 3)
-                    slow_queries += 1
+                    type_stats.add(exec_time, True)
                 else:
                     exec_time = random.uniform(config['min'], config['max'])
+                    type_stats.add(exec_time, False)
                     
-                total_time += exec_time
+                exec_times.append(exec_time)
                 
-            # Per-query-type metrics
-            avg_time = total_time / max(query_count, 1)
-            metrics[f'{query_type.lower()}_avg_time_ms'] = avg_time
-            metrics[f'{query_type.lower()}_count'] = query_count
+            stats.append(type_stats)
+            
+        return self._query_performance_metrics(stats, exec_times)
+        
+    def _query_performance_metrics(self, stats: List['QueryTypeStats'], exec_times) -> Dict[str, float]:
+        """Build query metrics from per-type stats and all execution times"""
+        metrics = {}
+        
+        # Per-query-type metrics and cumulative latency histograms
+        for query_type, type_stats in zip(self.query_metrics, stats):
+            name = query_type.lower()
+            metrics[f'{name}_avg_time_ms'] = type_stats.total_ms / max(type_stats.count, 1)
+            metrics[f'{name}_count'] = type_stats.count
             
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS_MS, type_stats.buckets):
+                cumulative += bucket
+                metrics[f'{name}_latency_le_{bound}_ms'] = cumulative
+                
+        total_queries = sum(s.count for s in stats)
+        total_time = sum(s.total_ms for s in stats)
+        slow_queries = sum(s.slow for s in stats)
+        
         # Overall metrics
         metrics['total_queries'] = total_queries
         metrics['average_query_time_ms'] = total_time / max(total_queries, 1)
         metrics['slow_queries_count'] = slow_queries
         metrics['slow_query_percentage'] = (slow_queries / max(total_queries, 1)) * 100
+        metrics.update(percentile_metrics('query_time', exec_times, '_ms'))
         
         return metrics
         
@@ -3,20 +3,56 @@ Kubernetes operations simulator
 Simulates pod lifecycle, scheduling, crashes, and other K8s events
 """
 
+import heapq
 import random
 import time
 import logging
-from typing import Dict, List
-from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from simulators.sampling import np, resolve_engine, binomial
+from simulators.pod_table import (
+    PodTable, STATE_NAMES, STATE_PENDING, STATE_RUNNING, STATE_TERMINATED,
+    STATE_CONTAINER_CREATING, STATE_CRASH_LOOP_BACKOFF, TERMINAL_STATES, NO_NODE
+)
+from simulators.pod_lifecycle import PodLifecycle, SCHEDULING_DELAY_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Synthetic cluster sizes: nodes, namespaces, deployments per namespace, replicas per deployment
+SCALE_PROFILES = {
+    'small': {'nodes': 50, 'namespaces': 10, 'deployments': 20, 'replicas': 5},        # 1k pods
+    'medium': {'nodes': 500, 'namespaces': 20, 'deployments': 50, 'replicas': 10},     # 10k pods
+    'large': {'nodes': 10000, 'namespaces': 50, 'deployments': 100, 'replicas': 25},   # 125k pods
+}
+
+# Fraction of running pods created/removed per cycle in scaled clusters
+SCALED_CHURN_RATE = 0.001
+
+# Budgeted series emitted per namespace and per pod by the workload breakdown
+NAMESPACE_SERIES = 5
+POD_SERIES = 3
+
+# Series in the namespace.other.* and pod.other.* rollups, also charged to the budget
+NAMESPACE_ROLLUP_SERIES = 5
+POD_ROLLUP_SERIES = 4
+
+# Chance per cycle that a running pod's container crashes
+POD_CRASH_PROBABILITY = 0.02
+
+# Individual pod failure log lines per cycle before switching to a summary
+MAX_FAILURE_LOG_LINES = 5
+
+# Metric name fragment for each pod state code
+STATE_METRIC_NAMES = ('pending', 'running', 'failed', 'terminated', 'container_creating', 'crashloop_backoff')
+
+# States entered through scheduled lifecycle transitions (Pending: replacements of evicted pods)
+LIFECYCLE_TARGET_STATES = (STATE_PENDING, STATE_CONTAINER_CREATING, STATE_RUNNING, STATE_CRASH_LOOP_BACKOFF)
+
 class KubernetesSimulator:
     """Simulates Kubernetes cluster operations and events"""
     
     def __init__(self, config):
         self.config = config
-        self.pod_states = {}
         self.namespace_stats = {
             'default': {'pods': 0, 'services': 5},
             'kube-system': {'pods': 0, 'services': 12},
@@ -24,8 +60,105 @@ class KubernetesSimulator:
             'ingress': {'pods': 0, 'services': 2}
         }
         
-        # Initialize some baseline pods
-        self._initialize_baseline_pods()
+        # Cluster shape: the hand-written baseline or a generated scale profile
+        self.scale_profile = self._resolve_scale_profile(config)
+        self.scaled = self.scale_profile is not None
+        self.node_count = self.scale_profile['nodes'] if self.scaled else config.K8S_NODE_COUNT or 3
+        
+        self.engine = resolve_engine(config.SIMULATION_ENGINE)
+        if self.engine == 'numpy':
+            self._rng = np.random.default_rng()
+            self.node_ready = np.ones(self.node_count, dtype=bool)
+        else:
+            self.node_ready = [True] * self.node_count
+        self.pods = PodTable(self.namespace_stats, use_numpy=self.engine == 'numpy')
+        self.lifecycle = PodLifecycle(self.pods, pick_node=self._pick_ready_node)
+        self.dynamic_pods: List[str] = []
+        self._dynamic_pod_seq = 0
+        
+        if self.scaled:
+            self._initialize_scaled_cluster(self.scale_profile)
+        else:
+            # Initialize some baseline pods
+            self._initialize_baseline_pods()
+            
+        # Bounds on the pod store so memory stays flat over long uptimes
+        self.max_pods = config.K8S_MAX_PODS
+        if self.max_pods < len(self.pods) * 1.1:
+            self.max_pods = int(len(self.pods) * 1.1) + 1
+            logger.info(f"Raised pod limit to {self.max_pods} to fit the generated cluster")
+        self.terminated_pod_ttl = config.K8S_TERMINATED_POD_TTL
+        
+        # Optional high-cardinality breakdowns
+        self.namespace_metrics = config.K8S_NAMESPACE_METRICS
+        self.pod_metrics = config.K8S_POD_METRICS
+        self.pod_metrics_top_k = config.K8S_POD_METRICS_TOP_K
+        self.pod_metrics_rank_by = config.K8S_POD_METRICS_RANK_BY
+        self.series_budget = config.K8S_SERIES_BUDGET
+        
+        logger.info(f"Kubernetes simulator initialized with {len(self.pods)} pods on "
+                    f"{self.node_count} nodes ({self.engine} engine)")
+        
+    @staticmethod
+    def _resolve_scale_profile(config):
+        """Return the cluster shape for config, or None for the baseline cluster"""
+        if config.K8S_SCALE_PROFILE == 'baseline':
+            return None
+            
+        profile = dict(SCALE_PROFILES[config.K8S_SCALE_PROFILE])
+        overrides = {
+            'nodes': config.K8S_NODE_COUNT,
+            'namespaces': config.K8S_NAMESPACES,
+            'deployments': config.K8S_DEPLOYMENTS_PER_NAMESPACE,
+            'replicas': config.K8S_REPLICAS_PER_DEPLOYMENT,
+        }
+        profile.update({key: value for key, value in overrides.items() if value > 0})
+        return profile
+        
+    def _initialize_scaled_cluster(self, profile: Dict[str, int]):
+        """Generate a synthetic cluster of deployments spread across namespaces and nodes"""
+        namespaces = [f'ns-{i}' for i in range(profile['namespaces'])]
+        for namespace in namespaces:
+            self.namespace_stats[namespace] = {'pods': 0, 'services': profile['deployments']}
+            self.pods.namespace_code(namespace)
+            
+        replicas = profile['replicas']
+        names = [
+            f"{namespace}-deploy-{d}-{r}"
+            for namespace in namespaces
+            for d in range(profile['deployments'])
+            for r in range(replicas)
+        ]
+        pod_count = len(names)
+        pods_per_namespace = profile['deployments'] * replicas
+        first_code = self.pods.namespace_codes[namespaces[0]]
+        now = time.time()
+        
+        if self.engine == 'numpy':
+            rng = self._rng
+            self.pods.add_many(
+                names,
+                np.repeat(np.arange(first_code, first_code + len(namespaces)), pods_per_namespace),
+                STATE_RUNNING,
+                restarts=rng.integers(0, 6, pod_count),
+                cpu=rng.uniform(10, 80, pod_count),
+                memory=rng.uniform(100, 800, pod_count),
+                created_at=now - rng.integers(1, 31, pod_count) * 86400,
+                node=rng.integers(0, self.node_count, pod_count)
+            )
+        else:
+            self.pods.add_many(
+                names,
+                [first_code + i // pods_per_namespace for i in range(pod_count)],
+                STATE_RUNNING,
+                restarts=[random.randint(0, 5) for _ in range(pod_count)],
+                cpu=[random.uniform(10, 80) for _ in range(pod_count)],
+                memory=[random.uniform(100, 800) for _ in range(pod_count)],
+                created_at=[now - random.randint(1, 30) * 86400 for _ in range(pod_count)],
+                node=[random.randrange(self.node_count) for _ in range(pod_count)]
+            )
+            
+        logger.info(f"Generated {pod_count} pods in {len(namespaces)} namespaces")
         
     def _initialize_baseline_pods(self):
         """Initialize baseline pod configuration"""
@@ -39,93 +172,228 @@ class KubernetesSimulator:
             {'name': 'nginx-ingress', 'namespace': 'ingress', 'replicas': 3}
         ]
         
+        now = time.time()
         for pod_config in baseline_pods:
             for i in range(pod_config['replicas']):
                 pod_name = f"{pod_config['name']}-{i}"
-                self.pod_states[pod_name] = {
-                    'namespace': pod_config['namespace'],
-                    'state': 'Running',
-                    'restart_count': random.randint(0, 5),
-                    'cpu_usage': random.uniform(10, 80),
-                    'memory_usage': random.uniform(100, 800),
-                    'created_at': datetime.utcnow() - timedelta(days=random.randint(1, 30))
-                }
+                self.pods.add(
+                    pod_name,
+                    pod_config['namespace'],
+                    STATE_RUNNING,
+                    restarts=random.randint(0, 5),
+                    cpu=random.uniform(10, 80),
+                    memory=random.uniform(100, 800),
+                    created_at=now - random.randint(1, 30) * 86400,
+                    node=random.randrange(self.node_count)
+                )
                 
+    def _pick_ready_node(self) -> int:
+        """A random Ready node for a replacement pod (any node if none is Ready)"""
+        if self.engine == 'numpy':
+            ready = np.flatnonzero(self.node_ready)
+            return int(self._rng.choice(ready)) if len(ready) else int(self._rng.integers(self.node_count))
+        ready = [node for node in range(self.node_count) if self.node_ready[node]]
+        return random.choice(ready) if ready else random.randrange(self.node_count)
+        
     def simulate_pod_scheduling(self) -> Dict[str, float]:
         """Simulate pod scheduling operations"""
         metrics = {}
         
+        # Reclaim terminated pods; when at the cap, reclaim them regardless of age. Evicted
+        # pods with a queued replacement are kept so the replacement can take their row.
+        keep = self.lifecycle.pending_replacements
+        metrics['pods_garbage_collected'] = self.pods.collect_garbage(self.terminated_pod_ttl, keep=keep)
+        if len(self.pods) >= self.max_pods:
+            metrics['pods_garbage_collected'] += self.pods.collect_garbage(0, keep=keep)
+            
         # Simulate new pod creation
-        if random.random() < 0.1:  # 10% chance of new pod
-            new_pod_name = f"dynamic-pod-{int(time.time())}"
-            scheduling_time = random.uniform(1.5, 8.0)  # 1.5-8 seconds
-            
-            self.pod_states[new_pod_name] = {
-                'namespace': random.choice(list(self.namespace_stats.keys())),
-                'state': 'Pending',
-                'restart_count': 0,
-                'cpu_usage': 0,
-                'memory_usage': 0,
-                'created_at': datetime.utcnow()
-            }
-            
-            logger.info(f"Scheduled new pod: {new_pod_name}")
-            metrics['pod_scheduling_time_seconds'] = scheduling_time
-            metrics['pods_scheduled_total'] = 1
+        if self.scaled:
+            # Churn proportional to cluster size
+            expected = SCALED_CHURN_RATE * self.pods.count(STATE_RUNNING)
+            new_pod_count = int(expected) + (1 if random.random() < expected % 1 else 0)
         else:
-            metrics['pods_scheduled_total'] = 0
+            new_pod_count = 1 if random.random() < 0.1 else 0  # 10% chance of new pod
+            
+        room = max(0, self.max_pods - len(self.pods))
+        unschedulable = max(0, new_pod_count - room)
+        if unschedulable:
+            logger.warning(f"Pod limit of {self.max_pods} reached, {unschedulable} new pods not scheduled")
+            new_pod_count = room
+            
+        namespaces = list(self.namespace_stats.keys())
+        scheduling_time = 0.0
+        for _ in range(new_pod_count):
+            self._dynamic_pod_seq += 1
+            new_pod_name = f"dynamic-pod-{int(time.time())}-{self._dynamic_pod_seq}"
+            self.pods.add(new_pod_name, random.choice(namespaces), STATE_PENDING,
+                          node=random.randrange(self.node_count))
+            self.dynamic_pods.append(new_pod_name)
+            
+            # Pending until the scheduler binds it, then the lifecycle takes over
+            delay = random.uniform(*SCHEDULING_DELAY_SECONDS)
+            self.lifecycle.pod_created(new_pod_name, delay)
+            scheduling_time += delay
+            if new_pod_count <= MAX_FAILURE_LOG_LINES:
+                logger.info(f"Scheduled new pod: {new_pod_name}")
+                
+        if new_pod_count > MAX_FAILURE_LOG_LINES:
+            logger.info(f"Scheduled {new_pod_count} new pods")
             
+        if new_pod_count:
+            metrics['pod_scheduling_time_seconds'] = scheduling_time / new_pod_count
+        metrics['pods_scheduled_total'] = new_pod_count
+        metrics['pods_unschedulable_total'] = unschedulable
+        
+        # Simulate scale-down of dynamic pods
+        scale_down_count = new_pod_count if self.scaled else (1 if random.random() < 0.1 else 0)
+        for _ in range(min(scale_down_count, len(self.dynamic_pods))):
+            pod_name = self.dynamic_pods.pop(random.randrange(len(self.dynamic_pods)))
+            row = self.pods.index.get(pod_name)
+            # Failed pods are terminated too, which cancels their pending replacement
+            if row is not None and self.pods.state[row] != STATE_TERMINATED:
+                self.pods.set_state(row, STATE_TERMINATED)
+                if scale_down_count <= MAX_FAILURE_LOG_LINES:
+                    logger.info(f"Terminated pod: {pod_name}")
+                    
+        metrics['pod_store_size'] = len(self.pods)
+        
         return metrics
         
     def simulate_pod_failures(self) -> Dict[str, float]:
         """Simulate pod crashes and failures"""
         metrics = {}
-        failures = 0
+        pods = self.pods
+        running_count = pods.count(STATE_RUNNING)
         
-        running_pods = [name for name, state in self.pod_states.items() 
-                       if state['state'] == 'Running']
+        # Simulate random container crashes (2% chance per running pod per cycle). Draw the
+        # number of candidates and pick that many rows, so only crashing pods are touched.
+        if self.engine == 'numpy':
+            candidates = self._rng.binomial(len(pods), POD_CRASH_PROBABILITY)
+            rows = self._rng.choice(len(pods), candidates, replace=False).tolist() if candidates else []
+        else:
+            candidates = binomial(len(pods), POD_CRASH_PROBABILITY)
+            rows = random.sample(range(len(pods)), candidates)
+            
+        # Crashed containers go into CrashLoopBackOff and are restarted by the lifecycle engine
+        crashed_rows = [row for row in rows if pods.state[row] == STATE_RUNNING]
+        for row in crashed_rows:
+            self.lifecycle.pod_crashed(row)
+            
+        failures = len(crashed_rows)
+        for row in crashed_rows[:MAX_FAILURE_LOG_LINES]:
+            logger.warning(f"Pod crashed: {pods.names[row]} (restarts: {pods.restarts[row]})")
+        if failures > MAX_FAILURE_LOG_LINES:
+            logger.warning(f"{failures} pods crashed this cycle")
+            
+        metrics['pod_failures_total'] = failures
+        metrics['pod_restart_rate'] = failures / max(running_count, 1)
         
-        # Simulate random pod failures
-        for pod_name in running_pods:
-            if random.random() < 0.02:  # 2% chance of failure per cycle
-                self.pod_states[pod_name]['state'] = 'Failed'
-                self.pod_states[pod_name]['restart_count'] += 1
-                failures += 1
-                
-                logger.warning(f"Pod failed: {pod_name}")
-                
-                # Simulate restart after failure
-                if random.random() < 0.8:  # 80% chance of successful restart
-                    self.pod_states[pod_name]['state'] = 'Running'
-                    logger.info(f"Pod restarted: {pod_name}")
+        return metrics
+        
+    def advance_pod_lifecycle(self) -> Dict[str, float]:
+        """Apply due lifecycle transitions and report pods per state"""
+        metrics = {}
+        transitions = self.lifecycle.advance()
+        
+        for code, (state_name, metric_name) in enumerate(zip(STATE_NAMES, STATE_METRIC_NAMES)):
+            metrics[f'pods_{metric_name}'] = self.pods.count(code)
+            if code in LIFECYCLE_TARGET_STATES:
+                metrics[f'pod_transitions_to_{metric_name}'] = transitions.get(state_name, 0)
+        metrics['pod_lifecycle_queue_depth'] = len(self.lifecycle)
+        
+        return metrics
+        
+    def simulate_node_health(self) -> Dict[str, float]:
+        """Simulate node readiness and pod distribution across nodes"""
+        metrics = {}
+        pods = self.pods
+        size = len(pods)
+        
+        if self.engine == 'numpy':
+            rng = self._rng
+            # Ready nodes occasionally go NotReady (0.1%); NotReady nodes recover half the time
+            flips = rng.random(self.node_count)
+            failed_nodes = self.node_ready & (flips < 0.001)
+            recovered_nodes = ~self.node_ready & (flips < 0.5)
+            self.node_ready = (self.node_ready & ~failed_nodes) | recovered_nodes
+            
+            # Running pods on failed nodes fail with them and are replaced by their controllers
+            evicted = np.flatnonzero(failed_nodes[np.maximum(pods.node[:size], 0)] &
+                                     (pods.node[:size] != NO_NODE) &
+                                     (pods.state[:size] == STATE_RUNNING)).tolist()
+            self.lifecycle.pods_evicted(evicted)
+            
+            pods_per_node = np.bincount(pods.node[:size][pods.node[:size] != NO_NODE], minlength=self.node_count)
+            node_failures = int(failed_nodes.sum())
+            evicted_count = len(evicted)
+            ready_count = int(self.node_ready.sum())
+            max_pods_per_node = int(pods_per_node.max()) if self.node_count else 0
+        else:
+            failed_nodes = set()
+            for node in range(self.node_count):
+                flip = random.random()
+                if self.node_ready[node] and flip < 0.001:
+                    self.node_ready[node] = False
+                    failed_nodes.add(node)
+                elif not self.node_ready[node] and flip < 0.5:
+                    self.node_ready[node] = True
                     
-        metrics['pod_failures_total'] = failures
-        metrics['pod_restart_rate'] = failures / max(len(running_pods), 1)
+            pods_per_node = [0] * self.node_count
+            evicted = []
+            for row in range(size):
+                node = pods.node[row]
+                if node == NO_NODE:
+                    continue
+                pods_per_node[node] += 1
+                if node in failed_nodes and pods.state[row] == STATE_RUNNING:
+                    evicted.append(row)
+            self.lifecycle.pods_evicted(evicted)
+            
+            node_failures = len(failed_nodes)
+            evicted_count = len(evicted)
+            ready_count = sum(self.node_ready)
+            max_pods_per_node = max(pods_per_node) if pods_per_node else 0
+            
+        if node_failures:
+            logger.warning(f"{node_failures} nodes became NotReady, {evicted_count} pods failed")
+            
+        metrics['nodes_total'] = self.node_count
+        metrics['nodes_ready'] = ready_count
+        metrics['nodes_not_ready'] = self.node_count - ready_count
+        metrics['node_failures'] = node_failures
+        metrics['pods_evicted_by_node_failure'] = evicted_count
+        metrics['pods_per_node_avg'] = size / max(self.node_count, 1)
+        metrics['pods_per_node_max'] = max_pods_per_node
         
         return metrics
         
     def simulate_resource_usage(self) -> Dict[str, float]:
         """Simulate pod resource usage"""
         metrics = {}
+        pods = self.pods
         
-        total_cpu = 0
-        total_memory = 0
-        pod_count = 0
+        running = pods.rows_in_state(STATE_RUNNING)
+        pod_count = len(running)
         
-        for pod_name, pod_state in self.pod_states.items():
-            if pod_state['state'] == 'Running':
+        if self.engine == 'numpy':
+            # Simulate realistic CPU and memory fluctuations for all running pods at once
+            pods.cpu[running] = np.clip(pods.cpu[running] + self._rng.uniform(-5, 15, pod_count), 5, 95)
+            pods.memory[running] = np.clip(pods.memory[running] + self._rng.uniform(-20, 50, pod_count), 50, 1000)
+            total_cpu = float(pods.cpu[running].sum())
+            total_memory = float(pods.memory[running].sum())
+        else:
+            total_cpu = 0
+            total_memory = 0
+            for row in running:
                 # Simulate realistic CPU and memory fluctuations
                 cpu_change = random.uniform(-5, 15)
                 memory_change = random.uniform(-20, 50)
                 
-                pod_state['cpu_usage'] = max(5, min(95, 
-                    pod_state['cpu_usage'] + cpu_change))
-                pod_state['memory_usage'] = max(50, min(1000, 
-                    pod_state['memory_usage'] + memory_change))
+                pods.cpu[row] = max(5, min(95, pods.cpu[row] + cpu_change))
+                pods.memory[row] = max(50, min(1000, pods.memory[row] + memory_change))
                 
-                total_cpu += pod_state['cpu_usage']
-                total_memory += pod_state['memory_usage']
-                pod_count += 1
+                total_cpu += pods.cpu[row]
+                total_memory += pods.memory[row]
                 
         if pod_count > 0:
             metrics['average_cpu_usage_percent'] = total_cpu / pod_count
@@ -138,6 +406,159 @@ class KubernetesSimulator:
             
         return metrics
         
+    def _namespace_totals(self) -> Tuple[List[int], List[int], List[float], List[float], List[int]]:
+        """Per-namespace live pods, running pods, running CPU, running memory and live restarts
+        
+        Each list is indexed by namespace code; live pods are those not Failed or Terminated.
+        """
+        pods = self.pods
+        size = len(pods)
+        namespace_count = len(pods.namespaces)
+        
+        if self.engine == 'numpy':
+            namespace = pods.namespace[:size]
+            state = pods.state[:size]
+            live = ~np.isin(state, TERMINAL_STATES)
+            running = state == STATE_RUNNING
+            running_namespace = namespace[running]
+            totals = (
+                np.bincount(namespace[live], minlength=namespace_count),
+                np.bincount(running_namespace, minlength=namespace_count),
+                np.bincount(running_namespace, weights=pods.cpu[:size][running], minlength=namespace_count),
+                np.bincount(running_namespace, weights=pods.memory[:size][running], minlength=namespace_count),
+                np.bincount(namespace[live], weights=pods.restarts[:size][live],
+                            minlength=namespace_count).astype(np.int64),
+            )
+            return tuple(column.tolist() for column in totals)
+            
+        live_pods = [0] * namespace_count
+        running_pods = [0] * namespace_count
+        cpu = [0.0] * namespace_count
+        memory = [0.0] * namespace_count
+        restarts = [0] * namespace_count
+        states, namespaces = pods.state, pods.namespace
+        for row in range(size):
+            state = states[row]
+            if state in TERMINAL_STATES:
+                continue
+            code = namespaces[row]
+            live_pods[code] += 1
+            restarts[code] += pods.restarts[row]
+            if state == STATE_RUNNING:
+                running_pods[code] += 1
+                cpu[code] += pods.cpu[row]
+                memory[code] += pods.memory[row]
+        return live_pods, running_pods, cpu, memory, restarts
+        
+    def _top_pods(self, k: int) -> List[int]:
+        """Rows of the k running pods with the highest value in the ranking column"""
+        pods = self.pods
+        running = pods.rows_in_state(STATE_RUNNING)
+        column = getattr(pods, self.pod_metrics_rank_by)
+        if k <= 0 or not len(running):
+            return []
+            
+        if self.engine == 'numpy':
+            values = column[running]
+            if k < len(running):
+                selected = np.argpartition(values, len(running) - k)[len(running) - k:]
+            else:
+                selected = np.arange(len(running))
+            selected = selected[np.argsort(values[selected])[::-1]]
+            return running[selected].tolist()
+        return heapq.nlargest(k, running, key=column.__getitem__)
+        
+    def _running_restarts(self) -> int:
+        """Restarts summed over running pods"""
+        pods = self.pods
+        running = pods.rows_in_state(STATE_RUNNING)
+        if self.engine == 'numpy':
+            return int(pods.restarts[running].sum())
+        return sum(pods.restarts[row] for row in running)
+        
+    def simulate_workload_breakdown(self) -> Dict[str, float]:
+        """Per-namespace and per-pod series, kept within the series budget
+        
+        Namespaces are emitted largest first and pods are the top-K by the
+        ranking column. Whatever does not fit in the budget is folded into a
+        fixed set of ``namespace.other.*`` and ``pod.other.*`` rollups, so the
+        totals stay complete while the number of distinct series stays bounded.
+        The rollups count against the budget too. Like the top-K, the pod
+        rollup covers running pods only.
+        """
+        metrics = {}
+        pods = self.pods
+        live_pods, running_pods, cpu, memory, restarts = self._namespace_totals()
+        
+        # Keep the namespace bookkeeping in sync with the pod store
+        for code, namespace in enumerate(pods.namespaces):
+            self.namespace_stats[namespace]['pods'] = live_pods[code]
+            
+        if not (self.namespace_metrics or self.pod_metrics):
+            return metrics
+            
+        budget = self.series_budget
+        emitted = 0
+        rolled_up = 0
+        
+        if self.pod_metrics:
+            # The pod rollup is always emitted, so reserve it first
+            budget -= POD_ROLLUP_SERIES
+            
+        if self.namespace_metrics:
+            fit = len(pods.namespaces)
+            if fit * NAMESPACE_SERIES > budget:
+                fit = max(budget - NAMESPACE_ROLLUP_SERIES, 0) // NAMESPACE_SERIES
+            ranked = sorted(range(len(pods.namespaces)), key=live_pods.__getitem__, reverse=True)
+            
+            for code in ranked[:fit]:
+                prefix = f'namespace.{pods.namespaces[code]}'
+                metrics[f'{prefix}.pods'] = live_pods[code]
+                metrics[f'{prefix}.pods_running'] = running_pods[code]
+                metrics[f'{prefix}.cpu_usage_percent_avg'] = cpu[code] / max(running_pods[code], 1)
+                metrics[f'{prefix}.memory_usage_mb_total'] = memory[code]
+                metrics[f'{prefix}.restarts_total'] = restarts[code]
+            emitted += fit * NAMESPACE_SERIES
+            
+            overflow = ranked[fit:]
+            if overflow:
+                other_running = sum(running_pods[code] for code in overflow)
+                metrics['namespace.other.namespaces'] = len(overflow)
+                metrics['namespace.other.pods'] = sum(live_pods[code] for code in overflow)
+                metrics['namespace.other.cpu_usage_percent_avg'] = \
+                    sum(cpu[code] for code in overflow) / max(other_running, 1)
+                metrics['namespace.other.memory_usage_mb_total'] = sum(memory[code] for code in overflow)
+                metrics['namespace.other.restarts_total'] = sum(restarts[code] for code in overflow)
+                emitted += NAMESPACE_ROLLUP_SERIES
+                rolled_up += len(overflow) * NAMESPACE_SERIES
+                
+        if self.pod_metrics:
+            k = min(self.pod_metrics_top_k, max(budget - emitted, 0) // POD_SERIES)
+            top_rows = self._top_pods(k)
+            for row in top_rows:
+                prefix = f'pod.{pods.names[row]}'
+                metrics[f'{prefix}.cpu_usage_percent'] = float(pods.cpu[row])
+                metrics[f'{prefix}.memory_usage_mb'] = float(pods.memory[row])
+                metrics[f'{prefix}.restarts'] = int(pods.restarts[row])
+                
+            emitted += len(top_rows) * POD_SERIES + POD_ROLLUP_SERIES
+            
+            other_count = sum(running_pods) - len(top_rows)
+            metrics['pod.other.pods'] = other_count
+            metrics['pod.other.cpu_usage_percent_avg'] = \
+                (sum(cpu) - sum(float(pods.cpu[row]) for row in top_rows)) / max(other_count, 1)
+            metrics['pod.other.memory_usage_mb_total'] = \
+                sum(memory) - sum(float(pods.memory[row]) for row in top_rows)
+            metrics['pod.other.restarts_total'] = \
+                self._running_restarts() - sum(int(pods.restarts[row]) for row in top_rows)
+            rolled_up += other_count * POD_SERIES
+            
+        metrics['breakdown_series_budget'] = self.series_budget
+        metrics['breakdown_series_emitted'] = emitted
+        metrics['breakdown_series_rolled_up'] = rolled_up
+        
+        return metrics
+        
     def simulate_networking(self) -> Dict[str, float]:
         """Simulate network-related metrics"""
         metrics = {}
@@ -161,13 +582,19 @@ class KubernetesSimulator:
         # Run all simulation components
         scheduling_metrics = self.simulate_pod_scheduling()
         failure_metrics = self.simulate_pod_failures()
+        lifecycle_metrics = self.advance_pod_lifecycle()
+        node_metrics = self.simulate_node_health()
         resource_metrics = self.simulate_resource_usage()
+        breakdown_metrics = self.simulate_workload_breakdown()
         network_metrics = self.simulate_networking()
         
         # Combine all metrics
         all_metrics.update(scheduling_metrics)
         all_metrics.update(failure_metrics)
+        all_metrics.update(lifecycle_metrics)
+        all_metrics.update(node_metrics)
         all_metrics.update(resource_metrics)
+        all_metrics.update(breakdown_metrics)
         all_metrics.update(network_metrics)
         
         # Add cluster-wide metrics
@@ -8,6 +8,8 @@ import time
 import logging
 from typing import Dict, List
 
+from simulators.sampling import np, resolve_engine, percentile, percentile_metrics
+
 logger = logging.getLogger(__name__)
 
 class NetworkSimulator:
@@ -23,20 +25,106 @@ class NetworkSimulator:
             'storage.blob.azure.com',
             'monitoring.newrelic.com'
         ]
+        # Extra synthetic in-cluster endpoints for scale testing
+        self.endpoints.extend(f'svc-{i}.cluster.local' for i in range(config.NETWORK_SYNTHETIC_ENDPOINTS))
         self.regions = ['eastus', 'westus', 'northeurope', 'southeastasia']
         
-        logger.info("Network simulator initialized")
+        # Metric names per endpoint, built once
+        self._endpoint_metric_names = []
+        for endpoint in self.endpoints:
+            endpoint_clean = endpoint.replace('.', '_').replace('-', '_')
+            self._endpoint_metric_names.append((
+                f'{endpoint_clean}_avg_latency_ms',
+                f'{endpoint_clean}_max_latency_ms',
+                f'{endpoint_clean}_min_latency_ms',
+                f'{endpoint_clean}_p95_latency_ms',
+            ))
+            
+        # 0 keeps the historical 10-30 samples per endpoint
+        self.samples_per_endpoint = config.NETWORK_SAMPLES_PER_ENDPOINT
+        self.engine = resolve_engine(config.SIMULATION_ENGINE)
+        if self.engine == 'numpy':
+            self._rng = np.random.default_rng()
+        
+        logger.info(f"Network simulator initialized with {len(self.endpoints)} endpoints ({self.engine} engine)")
         
     def simulate_latency_metrics(self) -> Dict[str, float]:
         """Simulate network latency measurements"""
-        metrics = {}
+        if self.engine == 'numpy':
+            metrics, latencies, total_latency, spikes = self._simulate_latency_numpy()
+        else:
+            metrics, latencies, total_latency, spikes = self._simulate_latency_python()
+            
+        total_measurements = len(latencies)
+        # (spike count, worst latency, worst endpoint, endpoints with a spike)
+        high_latency_count, worst_latency, worst_endpoint, endpoint_count = spikes
+        
+        # One summary line per cycle instead of one warning per spike
+        if high_latency_count:
+            logger.warning(f"High latency detected on {high_latency_count} samples across "
+                           f"{endpoint_count} endpoints (worst {worst_endpoint}: {worst_latency:.1f}ms)")
+            
+        # Overall latency metrics
+        metrics['overall_avg_latency_ms'] = total_latency / total_measurements
+        metrics['high_latency_events'] = high_latency_count
+        metrics['latency_spike_rate'] = (high_latency_count / total_measurements) * 100
+        metrics.update(percentile_metrics('overall_latency', latencies, '_ms'))
+        
+        return metrics
         
-        total_measurements = 0
-        total_latency = 0
-        high_latency_count = 0
+    def _simulate_latency_numpy(self):
+        """Generate every endpoint's latency samples as one array"""
+        rng = self._rng
+        endpoint_count = len(self.endpoints)
         
-        for endpoint in self.endpoints:
-            measurements = random.randint(10, 30)
+        if self.samples_per_endpoint:
+            counts = np.full(endpoint_count, self.samples_per_endpoint)
+        else:
+            counts = rng.integers(10, 31, endpoint_count)
+        total = int(counts.sum())
+        endpoint_index = np.repeat(np.arange(endpoint_count), counts)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        
+        # Base latency with normal variation and occasional 3-10x spikes (5%)
+        latencies = self.baseline_latency + rng.normal(0, 5, total)
+        spiked = rng.random(total) < 0.05
+        spike_count = int(spiked.sum())
+        latencies[spiked] *= rng.uniform(3, 10, spike_count)
+        latencies = np.maximum(1, latencies)  # Ensure positive latency
+        
+        # Per-endpoint aggregates
+        avg = np.bincount(endpoint_index, weights=latencies, minlength=endpoint_count) / counts
+        maximum = np.maximum.reduceat(latencies, offsets)
+        minimum = np.minimum.reduceat(latencies, offsets)
+        
+        # Per-endpoint p95 by interpolating within each endpoint's sorted block
+        ordered = latencies[np.lexsort((latencies, endpoint_index))]
+        position = offsets + (counts - 1) * 0.95
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, offsets + counts - 1)
+        p95 = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+        
+        metrics = {}
+        for names, values in zip(self._endpoint_metric_names, zip(avg.tolist(), maximum.tolist(),
+                                                                    minimum.tolist(), p95.tolist())):
+            metrics.update(zip(names, values))
+            
+        spikes = (0, 0.0, None, 0)
+        if spike_count:
+            spike_rows = np.flatnonzero(spiked)
+            worst = spike_rows[np.argmax(latencies[spike_rows])]
+            spikes = (spike_count, float(latencies[worst]), self.endpoints[endpoint_index[worst]],
+                      int(np.unique(endpoint_index[spike_rows]).size))
+        return metrics, latencies, float(latencies.sum()), spikes
+        
+    def _simulate_latency_python(self):
+        """Generate latency samples endpoint by endpoint with the random module"""
+        metrics = {}
+        all_latencies = []
+        spikes = []
+        
+        for endpoint, names in zip(self.endpoints, self._endpoint_metric_names):
+            measurements = self.samples_per_endpoint or random.randint(10, 30)
             endpoint_latencies = []
             
             for _ in range(measurements):
@@ -47,30 +135,27 @@ class NetworkSimulator:
                 if random.random() < 0.05:  # 5% chance of spike
                     spike_factor = random.uniform(3, 10)
                     latency *= spike_factor
-                    high_latency_count += 1
-                    logger.warning(f"High latency detected for {endpoint}: {latency:.1f}ms")
+                    spikes.append((max(1, latency), endpoint))
                 
                 latency = max(1, latency)  # Ensure positive latency
                 endpoint_latencies.append(latency)
-                total_latency += latency
-                total_measurements += 1
                 
             # Per-endpoint metrics
-            avg_latency = sum(endpoint_latencies) / len(endpoint_latencies)
-            max_latency = max(endpoint_latencies)
-            min_latency = min(endpoint_latencies)
-            
-            endpoint_clean = endpoint.replace('.', '_').replace('-', '_')
-            metrics[f'{endpoint_clean}_avg_latency_ms'] = avg_latency
-            metrics[f'{endpoint_clean}_max_latency_ms'] = max_latency
-            metrics[f'{endpoint_clean}_min_latency_ms'] = min_latency
+            endpoint_latencies.sort()
+            metrics.update(zip(names, (
+                sum(endpoint_latencies) / len(endpoint_latencies),
+                endpoint_latencies[-1],
+                endpoint_latencies[0],
+                percentile(endpoint_latencies, 95),
+            )))
+            all_latencies.extend(endpoint_latencies)
             
-        # Overall latency metrics
-        metrics['overall_avg_latency_ms'] = total_latency / total_measurements
-        metrics['high_latency_events'] = high_latency_count
-        metrics['latency_spike_rate'] = (high_latency_count / total_measurements) * 100
-        
-        return metrics
+        if spikes:
+            worst_latency, worst_endpoint = max(spikes)
+            summary = (len(spikes), worst_latency, worst_endpoint, len(set(endpoint for _, endpoint in spikes)))
+        else:
+            summary = (0, 0.0, None, 0)
+        return metrics, all_latencies, sum(all_latencies), summary
         
     def simulate_throughput_metrics(self) -> Dict[str, float]:
         """Simulate network throughput measurements"""
@@ -0,0 +1,148 @@
+"""
+Pod lifecycle engine
+Drives Pending -> ContainerCreating -> Running -> CrashLoopBackOff transitions from a priority queue,
+plus replacement of pods that failed with their node
+"""
+
+import heapq
+import random
+import time
+from typing import Callable, Dict, Optional, Set
+
+from simulators.pod_table import (
+    PodTable, STATE_NAMES, STATE_PENDING, STATE_CONTAINER_CREATING, STATE_RUNNING,
+    STATE_FAILED, STATE_CRASH_LOOP_BACKOFF
+)
+
+# Kubernetes restart backoff: 10s doubling up to 5 minutes
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 300
+
+# Chance that a restarted container crashes again before becoming ready
+CRASH_AGAIN_PROBABILITY = 0.2
+
+# Seconds for the owning controller to replace a pod evicted by a node failure
+REPLACEMENT_DELAY_SECONDS = (1.0, 5.0)
+
+# Seconds a Pending pod waits for the scheduler to bind it
+SCHEDULING_DELAY_SECONDS = (1.5, 8.0)
+
+
+class PodLifecycle:
+    """Timer queue of scheduled pod state transitions
+
+    Each entry records the state the pod must still be in for the transition
+    to apply, so entries made stale by other events (scale-down, node
+    failure, garbage collection) are simply discarded when they come due.
+    Only pods with a due transition are touched on each ``advance``.
+
+    Pods evicted by a node failure go to Failed and are replaced by their
+    controller: the row is reset to a fresh Pending pod, bound to the node
+    returned by ``pick_node`` (the old node when not given), and starts the
+    lifecycle again, so evictions do not shrink the cluster.
+    """
+
+    def __init__(self, pods: PodTable, pick_node: Optional[Callable[[], int]] = None):
+        self.pods = pods
+        self.pick_node = pick_node
+        self._queue = []
+        self._seq = 0
+        self._crash_streaks: Dict[str, int] = {}
+        # Failed pods whose replacement is still queued; garbage collection must keep them
+        self.pending_replacements: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def schedule(self, name: str, expected_state: int, next_state: int, delay: float,
+                 now: Optional[float] = None):
+        """Move a pod from expected_state to next_state after delay seconds"""
+        now = time.time() if now is None else now
+        self._seq += 1
+        heapq.heappush(self._queue, (now + delay, self._seq, name, expected_state, next_state))
+
+    def pod_created(self, name: str, scheduling_delay: float, now: Optional[float] = None):
+        """Start the lifecycle of a new Pending pod"""
+        self.schedule(name, STATE_PENDING, STATE_CONTAINER_CREATING, scheduling_delay, now)
+
+    def pod_crashed(self, row: int, now: Optional[float] = None):
+        """Put a running pod into CrashLoopBackOff and schedule its restart"""
+        pods = self.pods
+        name = pods.names[row]
+        pods.set_state(row, STATE_CRASH_LOOP_BACKOFF, now)
+        pods.restarts[row] += 1
+        self._schedule_restart(name, now)
+
+    def pods_evicted(self, rows, now: Optional[float] = None):
+        """Fail pods whose node went NotReady and schedule their replacement"""
+        now = time.time() if now is None else now
+        pods = self.pods
+        pods.set_state_many(rows, STATE_FAILED, now)
+        for row in rows:
+            name = pods.names[row]
+            self._crash_streaks.pop(name, None)
+            self.pending_replacements.add(name)
+            self.schedule(name, STATE_FAILED, STATE_PENDING, random.uniform(*REPLACEMENT_DELAY_SECONDS), now)
+
+    def _replace(self, row: int, now: float):
+        """Reset a failed pod's row to its replacement, a new Pending pod"""
+        pods = self.pods
+        pods.restarts[row] = 0
+        pods.created_at[row] = now
+        if self.pick_node is not None:
+            pods.node[row] = self.pick_node()
+        pods.set_state(row, STATE_PENDING, now)
+
+    def _schedule_restart(self, name: str, now: Optional[float]):
+        streak = self._crash_streaks.get(name, 0)
+        self._crash_streaks[name] = streak + 1
+        backoff = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** streak)
+        self.schedule(name, STATE_CRASH_LOOP_BACKOFF, STATE_CONTAINER_CREATING, backoff, now)
+
+    def advance(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Apply every transition that is due and return counts per new state"""
+        now = time.time() if now is None else now
+        pods = self.pods
+        queue = self._queue
+        transitions = {}
+
+        while queue and queue[0][0] <= now:
+            _, _, name, expected_state, next_state = heapq.heappop(queue)
+            if next_state == STATE_PENDING:
+                self.pending_replacements.discard(name)
+            row = pods.index.get(name)
+            if row is None:
+                # Pod was garbage collected while the transition was queued
+                self._crash_streaks.pop(name, None)
+                continue
+            if pods.state[row] != expected_state:
+                continue
+
+            if next_state == STATE_RUNNING and name in self._crash_streaks and \
+                    random.random() < CRASH_AGAIN_PROBABILITY:
+                # Container came up and crashed again before becoming ready
+                pods.set_state(row, STATE_CRASH_LOOP_BACKOFF, now)
+                pods.restarts[row] += 1
+                self._schedule_restart(name, now)
+                next_state = STATE_CRASH_LOOP_BACKOFF
+            elif next_state == STATE_PENDING:
+                self._replace(row, now)
+                self._schedule_follow_up(name, next_state, now)
+            else:
+                pods.set_state(row, next_state, now)
+                self._schedule_follow_up(name, next_state, now)
+
+            state_name = STATE_NAMES[next_state]
+            transitions[state_name] = transitions.get(state_name, 0) + 1
+
+        return transitions
+
+    def _schedule_follow_up(self, name: str, state: int, now: float):
+        """Queue the next automatic transition after entering a state"""
+        if state == STATE_PENDING:
+            self.pod_created(name, random.uniform(*SCHEDULING_DELAY_SECONDS), now)
+        elif state == STATE_CONTAINER_CREATING:
+            # Image pull and container start
+            self.schedule(name, STATE_CONTAINER_CREATING, STATE_RUNNING, random.uniform(2, 20), now)
+        elif state == STATE_RUNNING:
+            self._crash_streaks.pop(name, None)
@@ -0,0 +1,241 @@
+"""
+Columnar pod state store
+Keeps simulated pod state in flat typed columns instead of per-pod dicts
+"""
+
+import time
+from array import array
+from typing import AbstractSet, Dict, Iterable, List, Optional
+
+from simulators.sampling import np
+
+# Pod state codes
+STATE_PENDING = 0
+STATE_RUNNING = 1
+STATE_FAILED = 2
+STATE_TERMINATED = 3
+STATE_CONTAINER_CREATING = 4
+STATE_CRASH_LOOP_BACKOFF = 5
+
+STATE_NAMES = ('Pending', 'Running', 'Failed', 'Terminated', 'ContainerCreating', 'CrashLoopBackOff')
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+# States whose pods are eligible for garbage collection
+TERMINAL_STATES = (STATE_FAILED, STATE_TERMINATED)
+
+# Column name -> array typecode (used for both array.array and NumPy dtypes)
+COLUMNS = {
+    'namespace': 'h',
+    'state': 'b',
+    'restarts': 'i',
+    'cpu': 'd',
+    'memory': 'd',
+    'created_at': 'd',
+    'state_since': 'd',
+    'node': 'i',
+}
+
+# Node column value for pods not bound to a node
+NO_NODE = -1
+
+
+class PodTable:
+    """Fixed-schema table of pods stored column by column
+
+    Rows are dense: removing a pod moves the last row into its slot, so the
+    first ``len(table)`` entries of every column are always live. Columns
+    are NumPy arrays when ``use_numpy`` is set (enabling vectorized updates)
+    and ``array.array`` otherwise; either way a pod costs a few dozen bytes
+    instead of a dict with datetime objects.
+    """
+
+    __slots__ = ('use_numpy', 'names', 'index', 'namespaces', 'namespace_codes',
+                 'state_counts', 'size', 'capacity') + tuple(COLUMNS)
+
+    def __init__(self, namespaces: Iterable[str] = (), capacity: int = 64, use_numpy: bool = False):
+        self.use_numpy = use_numpy and np is not None
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.namespaces: List[str] = []
+        self.namespace_codes: Dict[str, int] = {}
+        self.state_counts = [0] * len(STATE_NAMES)
+        self.size = 0
+        self.capacity = max(capacity, 1)
+
+        for column, typecode in COLUMNS.items():
+            setattr(self, column, self._allocate(typecode, self.capacity))
+
+        for namespace in namespaces:
+            self.namespace_code(namespace)
+
+    def _allocate(self, typecode: str, capacity: int):
+        """Allocate a zero-filled column of the given capacity"""
+        if self.use_numpy:
+            return np.zeros(capacity, dtype=typecode)
+        return array(typecode, bytes(array(typecode).itemsize * capacity))
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        new_capacity = self.capacity * 2
+        for column, typecode in COLUMNS.items():
+            old = getattr(self, column)
+            if self.use_numpy:
+                new = np.zeros(new_capacity, dtype=typecode)
+                new[:self.size] = old[:self.size]
+            else:
+                new = old
+                new.extend(array(typecode, bytes(new.itemsize * (new_capacity - self.capacity))))
+            setattr(self, column, new)
+        self.capacity = new_capacity
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def namespace_code(self, namespace: str) -> int:
+        """Return the code for a namespace, registering it if needed"""
+        code = self.namespace_codes.get(namespace)
+        if code is None:
+            code = len(self.namespaces)
+            self.namespaces.append(namespace)
+            self.namespace_codes[namespace] = code
+        return code
+
+    def add(self, name: str, namespace: str, state: int, restarts: int = 0, cpu: float = 0.0,
+            memory: float = 0.0, created_at: Optional[float] = None, node: int = NO_NODE) -> int:
+        """Add a pod and return its row"""
+        if self.size == self.capacity:
+            self._grow()
+
+        now = time.time()
+        row = self.size
+        self.names.append(name)
+        self.index[name] = row
+        self.namespace[row] = self.namespace_code(namespace)
+        self.state[row] = state
+        self.restarts[row] = restarts
+        self.cpu[row] = cpu
+        self.memory[row] = memory
+        self.created_at[row] = now if created_at is None else created_at
+        self.state_since[row] = now
+        self.node[row] = node
+        self.state_counts[state] += 1
+        self.size += 1
+        return row
+
+    def add_many(self, names: List[str], namespace_codes, state: int, restarts, cpu, memory,
+                 created_at, node) -> range:
+        """Append many pods in the same state at once and return their rows
+
+        Column arguments are sequences (or NumPy arrays) of the same length
+        as ``names``; namespaces must already be registered.
+        """
+        count = len(names)
+        while self.size + count > self.capacity:
+            self._grow()
+
+        start, end = self.size, self.size + count
+        now = time.time()
+        values = {
+            'namespace': namespace_codes,
+            'state': [state] * count,
+            'restarts': restarts,
+            'cpu': cpu,
+            'memory': memory,
+            'created_at': created_at,
+            'state_since': [now] * count,
+            'node': node,
+        }
+        for column, typecode in COLUMNS.items():
+            target = getattr(self, column)
+            if self.use_numpy:
+                target[start:end] = values[column]
+            else:
+                target[start:end] = array(typecode, values[column])
+
+        for offset, name in enumerate(names):
+            self.index[name] = start + offset
+        self.names.extend(names)
+        self.state_counts[state] += count
+        self.size = end
+        return range(start, end)
+
+    def remove(self, row: int):
+        """Remove the pod at a row by moving the last row into its place"""
+        last = self.size - 1
+        name = self.names[row]
+        self.state_counts[self.state[row]] -= 1
+
+        if row != last:
+            for column in COLUMNS:
+                values = getattr(self, column)
+                values[row] = values[last]
+            moved = self.names[last]
+            self.names[row] = moved
+            self.index[moved] = row
+
+        self.names.pop()
+        del self.index[name]
+        self.size = last
+
+    def set_state(self, row: int, state: int, now: Optional[float] = None):
+        """Change a pod's state, keeping the per-state counts in sync"""
+        self.state_counts[self.state[row]] -= 1
+        self.state_counts[state] += 1
+        self.state[row] = state
+        self.state_since[row] = time.time() if now is None else now
+
+    def set_state_many(self, rows, state: int, now: Optional[float] = None):
+        """Change the state of many pods at once"""
+        now = time.time() if now is None else now
+        if self.use_numpy:
+            rows = np.asarray(rows, dtype=np.intp)
+            for old_state, count in enumerate(np.bincount(self.state[rows], minlength=len(STATE_NAMES))):
+                self.state_counts[old_state] -= int(count)
+            self.state[rows] = state
+            self.state_since[rows] = now
+            self.state_counts[state] += len(rows)
+        else:
+            for row in rows:
+                self.set_state(row, state, now)
+
+    def count(self, state: int) -> int:
+        return self.state_counts[state]
+
+    def rows_in_state(self, state: int):
+        """Rows of all pods in a state (a NumPy index array when columnar)"""
+        if self.use_numpy:
+            return np.flatnonzero(self.state[:self.size] == state)
+        states = self.state
+        return [row for row in range(self.size) if states[row] == state]
+
+    def collect_garbage(self, ttl: float, now: Optional[float] = None, keep: AbstractSet[str] = frozenset()) -> int:
+        """Remove pods that have been in a terminal state for at least ttl seconds
+
+        Pods named in ``keep`` (e.g. failed pods awaiting replacement) are never removed.
+        """
+        now = time.time() if now is None else now
+
+        if self.use_numpy:
+            size = self.size
+            expired = np.isin(self.state[:size], TERMINAL_STATES) & (now - self.state_since[:size] >= ttl)
+            candidates = np.flatnonzero(expired)[::-1].tolist()
+        else:
+            states = self.state
+            since = self.state_since
+            candidates = [row for row in range(self.size - 1, -1, -1)
+                          if states[row] in TERMINAL_STATES and now - since[row] >= ttl]
+
+        if keep:
+            candidates = [row for row in candidates if self.names[row] not in keep]
+
+        # Remove from the highest row down so swap-removal only moves surviving rows
+        for row in candidates:
+            self.remove(row)
+        return len(candidates)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the numeric columns"""
+        return sum(getattr(self, column).itemsize * self.capacity for column in COLUMNS)
@@ -0,0 +1,97 @@
+"""
+Process census
+Cheap per-cycle process counts from /proc/stat and /proc/loadavg, with a slower top-N process scan
+"""
+
+import re
+import time
+import heapq
+import logging
+from typing import Dict, Optional
+
+import psutil
+
+from simulators.counter_rates import CounterRates
+
+logger = logging.getLogger(__name__)
+
+RANK_COLUMNS = {'cpu': 'cpu_percent', 'memory': 'rss'}
+
+# Process names become a level of the metric name
+_INVALID_NAME_CHARS = re.compile(r'[^A-Za-z0-9_]')
+
+
+class ProcessCensus:
+    """System-wide process counts without walking /proc every cycle
+
+    With a procfs reader, each call takes the run queue, blocked task and
+    fork counters from the cycle's /proc/stat snapshot (read once by the
+    system collector and passed in) and the task count from /proc/loadavg.
+    The process count is a single listing of /proc, taken every cycle.
+    Every ``scan_interval`` seconds a full psutil.process_iter pass ranks
+    process names by CPU or RSS; its results are reused until the next
+    scan. Kernel threads (no RSS) are left out of the ranking.
+    process_iter keeps its Process handles between calls, so each scan's
+    CPU figures cover the time since the previous one.
+    """
+
+    def __init__(self, procfs=None, scan_interval: float = 60, top_n: int = 5, rank_by: str = 'cpu'):
+        self.procfs = procfs
+        self.scan_interval = scan_interval
+        self.top_n = top_n
+        self.rank_column = RANK_COLUMNS[rank_by]
+        self._fork_rates = CounterRates(('processes',))
+        self._scan_metrics: Dict[str, float] = {}
+        self._scanned_at: Optional[float] = None
+
+    def _scan_due(self, now: float) -> bool:
+        return self.scan_interval > 0 and (self._scanned_at is None or now - self._scanned_at >= self.scan_interval)
+
+    def _scan(self):
+        """Walk every process once and keep the top-N process names"""
+        start = time.perf_counter()
+        by_name: Dict[str, Dict[str, float]] = {}
+        for proc in psutil.process_iter(['name', 'cpu_percent', 'memory_info']):
+            info = proc.info
+            rss = info['memory_info'].rss if info['memory_info'] else 0
+            if not rss:
+                # Kernel threads have no user memory and are not workload processes
+                continue
+            name = _INVALID_NAME_CHARS.sub('_', info['name'] or 'unknown')
+            totals = by_name.setdefault(name, {'cpu_percent': 0.0, 'rss': 0, 'count': 0})
+            totals['cpu_percent'] += info['cpu_percent'] or 0.0
+            totals['rss'] += rss
+            totals['count'] += 1
+
+        metrics = {}
+        top = heapq.nlargest(self.top_n, by_name.items(), key=lambda item: item[1][self.rank_column])
+        for name, totals in top:
+            metrics[f'process.{name}.cpu_percent'] = totals['cpu_percent']
+            metrics[f'process.{name}.rss_mb'] = totals['rss'] / (1024**2)
+            metrics[f'process.{name}.count'] = totals['count']
+        metrics['process_scan_ms'] = (time.perf_counter() - start) * 1000
+        self._scan_metrics = metrics
+
+    def get_metrics(self, stat=None, stat_time: Optional[float] = None) -> Dict[str, float]:
+        """Process metrics; ``stat`` is this cycle's StatSnapshot, read at monotonic ``stat_time``"""
+        metrics = {}
+        now = time.monotonic()
+
+        if self.procfs and stat is not None:
+            loadavg = self.procfs.loadavg()
+            metrics['system_task_count'] = loadavg.tasks
+            metrics['system_procs_running'] = stat.procs_running
+            metrics['system_procs_blocked'] = stat.procs_blocked
+            rates = self._fork_rates.update({'system': stat}, now if stat_time is None else stat_time).get('system')
+            if rates:
+                metrics['system_forks_per_sec'] = rates['processes']
+
+        metrics['system_process_count'] = len(psutil.pids())
+
+        if self._scan_due(now):
+            self._scan()
+            self._scanned_at = now
+        if self._scanned_at is not None:
+            metrics.update(self._scan_metrics)
+            metrics['process_scan_age_seconds'] = now - self._scanned_at
+        return metrics
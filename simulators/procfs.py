@@ -0,0 +1,271 @@
+"""
+Direct /proc reader
+Linux-only system counters read with pread into reusable buffers and parsed in one pass
+"""
+
+import os
+import re
+import glob
+import threading
+import logging
+from collections import namedtuple
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = '/proc'
+SYS_CPU_ROOT = '/sys/devices/system/cpu'
+SECTOR_SIZE = 512  # /proc/diskstats always counts 512-byte sectors
+
+# Field names match psutil's Linux namedtuples, so callers can use either source
+CpuTimes = namedtuple('CpuTimes', 'user nice system idle iowait irq softirq steal guest guest_nice')
+VirtualMemory = namedtuple('VirtualMemory', 'total available percent used free buffers cached')
+SwapMemory = namedtuple('SwapMemory', 'total used free percent')
+DiskCounters = namedtuple('DiskCounters', 'read_count write_count read_bytes write_bytes read_time write_time busy_time')
+NetCounters = namedtuple('NetCounters', 'bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout')
+StatSnapshot = namedtuple('StatSnapshot', 'cpu per_cpu boot_time processes procs_running procs_blocked')
+LoadAvg = namedtuple('LoadAvg', 'load1 load5 load15 runnable tasks last_pid')
+CpuFreq = namedtuple('CpuFreq', 'current min max')
+
+# "MemTotal:       16303424 kB"
+_MEMINFO_FIELD = re.compile(rb'^(\w+):\s+(\d+)', re.MULTILINE)
+MEMINFO_FIELDS = (b'MemTotal', b'MemFree', b'MemAvailable', b'Buffers', b'Cached', b'SReclaimable',
+                  b'SwapTotal', b'SwapFree')
+
+
+def procfs_available() -> bool:
+    """True when the files read by ProcfsReader can be opened"""
+    return os.access(os.path.join(PROC_ROOT, 'stat'), os.R_OK)
+
+
+class ProcfsFile:
+    """A /proc file kept open and re-read from offset 0 into a reusable buffer
+
+    procfs regenerates the content on every read at offset 0, so the file
+    descriptor never needs to be reopened. The buffer grows when a file
+    outgrows it and is then reused for every later read.
+    """
+
+    def __init__(self, path: str, size: int = 4096):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+        self._buffer = bytearray(size)
+        self._lock = threading.Lock()
+
+    def read(self) -> bytearray:
+        """Current content of the file"""
+        with self._lock:
+            length = 0
+            while True:
+                view = memoryview(self._buffer)[length:]
+                count = os.preadv(self.fd, [view], length)
+                view.release()
+                length += count
+                # procfs fills the whole buffer unless it reached the end of the file
+                if length < len(self._buffer):
+                    return self._buffer[:length]
+                self._buffer.extend(bytes(len(self._buffer)))
+
+    def close(self):
+        os.close(self.fd)
+
+
+def parse_stat(data: bytes, ticks: int) -> StatSnapshot:
+    """Parse /proc/stat: aggregate and per-CPU times (seconds), boot time, forks and run queue
+
+    ``ticks`` is the kernel's USER_HZ (``os.sysconf('SC_CLK_TCK')``).
+    """
+    cpu = None
+    per_cpu = []
+    boot_time = processes = procs_running = procs_blocked = 0
+    for line in data.split(b'\n'):
+        if line.startswith(b'cpu'):
+            fields = line.split()
+            times = [int(value) / ticks for value in fields[1:11]]
+            times += [0.0] * (10 - len(times))
+            if fields[0] == b'cpu':
+                cpu = CpuTimes(*times)
+            else:
+                per_cpu.append(CpuTimes(*times))
+        elif line.startswith(b'btime'):
+            boot_time = int(line.split()[1])
+        elif line.startswith(b'processes'):
+            processes = int(line.split()[1])
+        elif line.startswith(b'procs_running'):
+            procs_running = int(line.split()[1])
+        elif line.startswith(b'procs_blocked'):
+            procs_blocked = int(line.split()[1])
+    return StatSnapshot(cpu, per_cpu, boot_time, processes, procs_running, procs_blocked)
+
+
+def parse_loadavg(data: bytes) -> LoadAvg:
+    """Parse /proc/loadavg ("0.60 1.00 0.89 2/345 12345")"""
+    load1, load5, load15, entities, last_pid = data.split()
+    runnable, _, tasks = entities.partition(b'/')
+    return LoadAvg(float(load1), float(load5), float(load15), int(runnable), int(tasks), int(last_pid))
+
+
+def parse_meminfo(data: bytes, fields=MEMINFO_FIELDS) -> Dict[bytes, int]:
+    """Parse the kB-valued /proc/meminfo ``fields`` into {field: bytes}; missing fields are omitted"""
+    raw = dict(_MEMINFO_FIELD.findall(data))
+    return {field: int(raw[field]) * 1024 for field in fields if field in raw}
+
+
+def parse_diskstats(data: bytes) -> Dict[str, DiskCounters]:
+    """Parse /proc/diskstats into {device: DiskCounters}"""
+    disks = {}
+    for line in data.split(b'\n'):
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        disks[fields[2].decode()] = DiskCounters(
+            read_count=int(fields[3]),
+            write_count=int(fields[7]),
+            read_bytes=int(fields[5]) * SECTOR_SIZE,
+            write_bytes=int(fields[9]) * SECTOR_SIZE,
+            read_time=int(fields[6]),
+            write_time=int(fields[10]),
+            busy_time=int(fields[12]),
+        )
+    return disks
+
+
+def parse_net_dev(data: bytes) -> Dict[str, NetCounters]:
+    """Parse /proc/net/dev into {interface: NetCounters}"""
+    nics = {}
+    # Two header lines, then "  eth0: rx_bytes rx_packets rx_errs rx_drop ... tx_bytes ..."
+    for line in data.split(b'\n')[2:]:
+        name, sep, counters = line.partition(b':')
+        if not sep:
+            continue
+        fields = counters.split()
+        nics[name.strip().decode()] = NetCounters(
+            bytes_sent=int(fields[8]),
+            bytes_recv=int(fields[0]),
+            packets_sent=int(fields[9]),
+            packets_recv=int(fields[1]),
+            errin=int(fields[2]),
+            errout=int(fields[10]),
+            dropin=int(fields[3]),
+            dropout=int(fields[11]),
+        )
+    return nics
+
+
+def _percent(part: float, total: float) -> float:
+    return round(part / total * 100, 1) if total else 0.0
+
+
+class ProcfsReader:
+    """Drop-in replacement for the psutil system-wide calls used by SystemMonitor
+
+    /proc/stat, /proc/meminfo, /proc/diskstats, /proc/net/dev and
+    /proc/loadavg are opened once. Every call re-reads one file with a single pread and parses it in
+    one pass, instead of psutil reopening and re-parsing files per call.
+    The cpufreq policies' scaling_cur_freq files in sysfs are kept open the
+    same way, and their fixed min/max limits are read once.
+    """
+
+    def __init__(self, root: str = PROC_ROOT, sys_cpu_root: str = SYS_CPU_ROOT):
+        self.root = root
+        self._stat = ProcfsFile(os.path.join(root, 'stat'))
+        self._meminfo = ProcfsFile(os.path.join(root, 'meminfo'))
+        self._diskstats = ProcfsFile(os.path.join(root, 'diskstats'))
+        self._net_dev = ProcfsFile(os.path.join(root, 'net', 'dev'))
+        self._loadavg = ProcfsFile(os.path.join(root, 'loadavg'))
+        self._ticks = os.sysconf('SC_CLK_TCK')
+        # Whole disks (as opposed to partitions), looked up once per device name
+        self._whole_disks: Dict[str, bool] = {}
+        self._boot_time = None
+        self._cpufreq_files, self._cpufreq_limits = self._open_cpufreq(sys_cpu_root)
+
+    @staticmethod
+    def _open_cpufreq(sys_cpu_root: str) -> Tuple[List[ProcfsFile], Tuple[float, float]]:
+        """Open every policy's scaling_cur_freq and average the min/max limits (MHz)
+
+        Returns no files when the kernel exposes no cpufreq policies (VMs, containers without sysfs).
+        """
+        files, mins, maxes = [], [], []
+        for policy in sorted(glob.glob(os.path.join(sys_cpu_root, 'cpufreq', 'policy[0-9]*'))):
+            try:
+                with open(os.path.join(policy, 'cpuinfo_min_freq')) as f:
+                    mins.append(int(f.read()) / 1000)
+                with open(os.path.join(policy, 'cpuinfo_max_freq')) as f:
+                    maxes.append(int(f.read()) / 1000)
+                files.append(ProcfsFile(os.path.join(policy, 'scaling_cur_freq'), 64))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Skipping cpufreq policy {policy}: {e}")
+        if not files:
+            return [], (0.0, 0.0)
+        return files, (sum(mins) / len(mins), sum(maxes) / len(maxes))
+
+    def stat(self) -> StatSnapshot:
+        return parse_stat(self._stat.read(), self._ticks)
+
+    def cpu_times_all(self) -> Tuple[CpuTimes, List[CpuTimes]]:
+        """Aggregate and per-CPU times from one read of /proc/stat"""
+        snapshot = self.stat()
+        return snapshot.cpu, snapshot.per_cpu
+
+    def boot_time(self) -> float:
+        if self._boot_time is None:
+            self._boot_time = float(self.stat().boot_time)
+        return self._boot_time
+
+    def memory(self) -> Tuple[VirtualMemory, SwapMemory]:
+        """Virtual and swap memory from one read of /proc/meminfo"""
+        mem = parse_meminfo(self._meminfo.read())
+        total = mem.get(b'MemTotal', 0)
+        free = mem.get(b'MemFree', 0)
+        buffers = mem.get(b'Buffers', 0)
+        cached = mem.get(b'Cached', 0) + mem.get(b'SReclaimable', 0)
+        available = mem.get(b'MemAvailable') or free + buffers + cached
+        available = min(available, total)
+        used = total - available
+        virtual = VirtualMemory(total, available, _percent(used, total), used, free, buffers, cached)
+
+        swap_total = mem.get(b'SwapTotal', 0)
+        swap_free = mem.get(b'SwapFree', 0)
+        swap_used = swap_total - swap_free
+        swap = SwapMemory(swap_total, swap_used, swap_free, _percent(swap_used, swap_total))
+        return virtual, swap
+
+    def _is_whole_disk(self, name: str) -> bool:
+        whole = self._whole_disks.get(name)
+        if whole is None:
+            whole = self._whole_disks[name] = os.path.exists(f'/sys/block/{name.replace("/", "!")}')
+        return whole
+
+    def disk_io_counters(self) -> Tuple[DiskCounters, Dict[str, DiskCounters]]:
+        """Machine-wide and per-device disk counters from one read of /proc/diskstats
+
+        Like psutil, the machine-wide figures sum whole disks only, since a
+        disk's counters already include its partitions.
+        """
+        per_disk = parse_diskstats(self._diskstats.read())
+        whole_disks = [counters for name, counters in per_disk.items() if self._is_whole_disk(name)]
+        total = DiskCounters(*(sum(values) for values in zip(*whole_disks))) if whole_disks else None
+        return total, per_disk
+
+    def net_io_counters(self) -> Tuple[NetCounters, Dict[str, NetCounters]]:
+        """Machine-wide and per-interface counters from one read of /proc/net/dev"""
+        per_nic = parse_net_dev(self._net_dev.read())
+        total = NetCounters(*(sum(values) for values in zip(*per_nic.values()))) if per_nic else None
+        return total, per_nic
+
+    def loadavg(self) -> LoadAvg:
+        """Load averages and scheduler task counts from /proc/loadavg"""
+        return parse_loadavg(self._loadavg.read())
+
+    def cpu_freq(self):
+        """Average current frequency and limits in MHz like psutil.cpu_freq(); None without cpufreq"""
+        if not self._cpufreq_files:
+            return None
+        current = sum(int(procfs_file.read()) for procfs_file in self._cpufreq_files) / 1000
+        low, high = self._cpufreq_limits
+        return CpuFreq(current / len(self._cpufreq_files), low, high)
+
+    def close(self):
+        for procfs_file in (self._stat, self._meminfo, self._diskstats, self._net_dev, self._loadavg,
+                            *self._cpufreq_files):
+            procfs_file.close()
@@ -0,0 +1,77 @@
+"""
+Shared sampling helpers for the simulators
+Optional NumPy backend selection and pure-Python percentile fallback
+"""
+
+import math
+import random
+import logging
+from typing import Dict, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('auto', 'numpy', 'python')
+
+# Percentiles reported by the vectorized engines
+PERCENTILES = (50, 95, 99)
+
+
+def resolve_engine(requested: str) -> str:
+    """Pick the sampling engine: NumPy when requested/available, else pure Python"""
+    if requested == 'python':
+        return 'python'
+    if np is None:
+        if requested == 'numpy':
+            logger.warning("NumPy requested for simulation but not installed, using Python engine")
+        return 'python'
+    return 'numpy'
+
+
+def binomial(n: int, p: float) -> int:
+    """Draw from Binomial(n, p) in O(successes) by skipping geometric gaps"""
+    if n <= 0 or p <= 0:
+        return 0
+    if p >= 1:
+        return n
+
+    log_q = math.log(1 - p)
+    successes = 0
+    position = -1
+    while True:
+        position += int(math.log(1 - random.random()) / log_q) + 1
+        if position >= n:
+            return successes
+        successes += 1
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values (NumPy's default method)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def percentile_metrics(prefix: str, values, suffix: str = '') -> Dict[str, float]:
+    """Return {prefix_pNN_suffix: value} for the standard percentiles
+
+    ``values`` may be a NumPy array or any sequence of floats.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        if values.size == 0:
+            results = [0.0] * len(PERCENTILES)
+        else:
+            results = np.percentile(values, PERCENTILES).tolist()
+    else:
+        ordered = sorted(values)
+        results = [percentile(ordered, q) for q in PERCENTILES]
+
+    return {f'{prefix}_p{q}{suffix}': value for q, value in zip(PERCENTILES, results)}
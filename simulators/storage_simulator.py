@@ -6,8 +6,12 @@ Simulates file uploads, downloads, and storage metrics
 import random
 import time
 import logging
+from collections import Counter
+from itertools import accumulate
 from typing import Dict, List
 
+from simulators.sampling import np, resolve_engine, percentile_metrics
+
 logger = logging.getLogger(__name__)
 
 class StorageSimulator:
@@ -24,27 +28,87 @@ class StorageSimulator:
             'backups': {'size_range': (1000, 50000), 'weight': 0.1}
         }
         
-        logger.info("Azure Blob Storage simulator initialized")
+        # Cumulative weight table and size bounds, built once for batch draws
+        self._file_type_names = list(self.file_types.keys())
+        self._file_type_cum_weights = list(accumulate(props['weight'] for props in self.file_types.values()))
+        self._file_size_ranges = [props['size_range'] for props in self.file_types.values()]
+        
+        # 0 keeps the historical per-cycle operation counts
+        self.uploads_per_cycle = config.STORAGE_UPLOADS_PER_CYCLE
+        self.downloads_per_cycle = config.STORAGE_DOWNLOADS_PER_CYCLE
+        self.engine = resolve_engine(config.SIMULATION_ENGINE)
+        if self.engine == 'numpy':
+            self._rng = np.random.default_rng()
+            self._cum_weights = np.array(self._file_type_cum_weights) / self._file_type_cum_weights[-1]
+            self._size_low = np.array([low for low, _ in self._file_size_ranges], dtype=float)
+            self._size_high = np.array([high for _, high in self._file_size_ranges], dtype=float)
+        
+        logger.info(f"Azure Blob Storage simulator initialized ({self.engine} engine)")
         
     def simulate_upload_operations(self) -> Dict[str, float]:
         """Simulate blob upload operations"""
+        total_uploads = self.uploads_per_cycle or random.randint(10, 50)
+        
+        if self.engine == 'numpy':
+            type_index, sizes, upload_times, failed = self._draw_uploads_numpy(total_uploads)
+            failed_by_type = Counter({
+                self._file_type_names[i]: int(count)
+                for i, count in enumerate(np.bincount(type_index[failed], minlength=len(self._file_type_names)))
+                if count
+            })
+            total_size_kb = float(sizes.sum())
+            total_upload_time = float(upload_times.sum())
+        else:
+            sizes, upload_times, failed_by_type = self._draw_uploads_python(total_uploads)
+            total_size_kb = sum(sizes)
+            total_upload_time = sum(upload_times)
+            
+        failed_uploads = sum(failed_by_type.values())
+        if failed_uploads:
+            details = ', '.join(f"{file_type}: {count}" for file_type, count in failed_by_type.items())
+            logger.warning(f"Blob uploads failed for {failed_uploads} files ({details})")
+            
         metrics = {}
+        metrics['uploads_total'] = total_uploads
+        metrics['uploads_failed'] = failed_uploads
+        metrics['upload_success_rate'] = ((total_uploads - failed_uploads) / total_uploads) * 100
+        metrics['total_upload_size_kb'] = total_size_kb
+        metrics['average_upload_time_seconds'] = total_upload_time / total_uploads
+        metrics['upload_throughput_kbps'] = total_size_kb / max(total_upload_time, 0.1)
+        metrics.update(percentile_metrics('upload_size', sizes, '_kb'))
+        metrics.update(percentile_metrics('upload_time', upload_times, '_seconds'))
         
-        total_uploads = random.randint(10, 50)
-        total_size_kb = 0
-        total_upload_time = 0
-        failed_uploads = 0
-        
-        for _ in range(total_uploads):
-            # Select file type and size
-            file_type = random.choices(
-                list(self.file_types.keys()),
-                weights=[props['weight'] for props in self.file_types.values()]
-            )[0]
-            
-            size_range = self.file_types[file_type]['size_range']
-            file_size_kb = random.uniform(size_range[0], size_range[1])
-            total_size_kb += file_size_kb
+        return metrics
+        
+    def _draw_uploads_numpy(self, total_uploads: int):
+        """Draw file types, sizes, network factors and failures as arrays"""
+        rng = self._rng
+        
+        # Select file type and size
+        type_index = np.searchsorted(self._cum_weights, rng.random(total_uploads), side='right')
+        low = self._size_low[type_index]
+        sizes = low + rng.random(total_uploads) * (self._size_high[type_index] - low)
+        
+        # Upload time based on file size (1MB per second) and network variance
+        upload_times = (sizes / 1000) * rng.uniform(0.5, 2.0, total_uploads)
+        
+        # Occasional upload failures (3%) take twice as long
+        failed = rng.random(total_uploads) < 0.03
+        upload_times[failed] *= 2
+        
+        return type_index, sizes, upload_times, failed
+        
+    def _draw_uploads_python(self, total_uploads: int):
+        """Draw uploads with the random module using the prebuilt weight table"""
+        sizes = []
+        upload_times = []
+        failed_by_type = Counter()
+        
+        file_types = random.choices(range(len(self._file_type_names)),
+                                    cum_weights=self._file_type_cum_weights, k=total_uploads)
+        for type_index in file_types:
+            low, high = self._file_size_ranges[type_index]
+            file_size_kb = random.uniform(low, high)
             
             # Simulate upload time based on file size and network conditions
             base_upload_time = file_size_kb / 1000  # Base: 1MB per second
@@ -53,53 +117,66 @@ class StorageSimulator:
             
             # Simulate occasional upload failures
             if random.random() < 0.03:  # 3% failure rate
-                failed_uploads += 1
+                failed_by_type[self._file_type_names[type_index]] += 1
                 upload_time *= 2  # Failed uploads take longer
-                logger.warning(f"Blob upload failed for {file_type} file")
-            
-            total_upload_time += upload_time
+                
+            sizes.append(file_size_kb)
+            upload_times.append(upload_time)
             
-        metrics['uploads_total'] = total_uploads
-        metrics['uploads_failed'] = failed_uploads
-        metrics['upload_success_rate'] = ((total_uploads - failed_uploads) / total_uploads) * 100
-        metrics['total_upload_size_kb'] = total_size_kb
-        metrics['average_upload_time_seconds'] = total_upload_time / total_uploads
-        metrics['upload_throughput_kbps'] = total_size_kb / max(total_upload_time, 0.1)
-        
-        return metrics
+        return sizes, upload_times, failed_by_type
         
     def simulate_download_operations(self) -> Dict[str, float]:
         """Simulate blob download operations"""
-        metrics = {}
+        total_downloads = self.downloads_per_cycle or random.randint(20, 100)
         
-        total_downloads = random.randint(20, 100)
-        total_size_kb = 0
-        total_download_time = 0
-        cache_hits = 0
-        
-        for _ in range(total_downloads):
-            # File size for downloads (typically requested files)
-            file_size_kb = random.uniform(50, 5000)
-            total_size_kb += file_size_kb
+        if self.engine == 'numpy':
+            rng = self._rng
+            sizes = rng.uniform(50, 5000, total_downloads)
+            
+            # 40% cache hits are fast; misses download at 2MB per second with network variance
+            cache_hit = rng.random(total_downloads) < 0.4
+            download_times = np.where(
+                cache_hit,
+                rng.uniform(0.1, 0.5, total_downloads),
+                (sizes / 2000) * rng.uniform(0.8, 1.5, total_downloads)
+            )
+            cache_hits = int(cache_hit.sum())
+            total_size_kb = float(sizes.sum())
+            total_download_time = float(download_times.sum())
+        else:
+            sizes = []
+            download_times = []
+            cache_hits = 0
             
-            # Simulate cache hits
-            if random.random() < 0.4:  # 40% cache hit rate
-                cache_hits += 1
-                download_time = random.uniform(0.1, 0.5)  # Cache hits are fast
-            else:
-                # Actual download from blob storage
-                base_download_time = file_size_kb / 2000  # 2MB per second
-                network_factor = random.uniform(0.8, 1.5)
-                download_time = base_download_time * network_factor
+            for _ in range(total_downloads):
+                # File size for downloads (typically requested files)
+                file_size_kb = random.uniform(50, 5000)
                 
-            total_download_time += download_time
+                # Simulate cache hits
+                if random.random() < 0.4:  # 40% cache hit rate
+                    cache_hits += 1
+                    download_time = random.uniform(0.1, 0.5)  # Cache hits are fast
+                else:
+                    # Actual download from blob storage
+                    base_download_time = file_size_kb / 2000  # 2MB per second
+                    network_factor = random.uniform(0.8, 1.5)
+                    download_time = base_download_time * network_factor
+                    
+                sizes.append(file_size_kb)
+                download_times.append(download_time)
+                
+            total_size_kb = sum(sizes)
+            total_download_time = sum(download_times)
             
+        metrics = {}
         metrics['downloads_total'] = total_downloads
         metrics['download_cache_hits'] = cache_hits
         metrics['download_cache_hit_rate'] = (cache_hits / total_downloads) * 100
         metrics['total_download_size_kb'] = total_size_kb
         metrics['average_download_time_seconds'] = total_download_time / total_downloads
         metrics['download_throughput_kbps'] = total_size_kb / max(total_download_time, 0.1)
+        metrics.update(percentile_metrics('download_size', sizes, '_kb'))
+        metrics.update(percentile_metrics('download_time', download_times, '_seconds'))
         
         return metrics
         
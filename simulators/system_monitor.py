@@ -1,57 +1,146 @@
 """
 System resource monitoring
-Monitors CPU, memory, disk, and other system metrics using psutil
+Monitors CPU, memory, disk, and other system metrics using psutil or /proc directly
 """
 
+import re
+import time
 import psutil
 import random
 import logging
 from typing import Dict
 
+from simulators.cgroup import CgroupMonitor, find_own_cgroup
+from simulators.connection_stats import ConnectionStateCounter
+from simulators.counter_rates import CounterRates
+from simulators.cpu_sampler import CpuSampler, read_psutil_times
+from simulators.process_census import ProcessCensus
+from simulators.procfs import ProcfsReader, procfs_available
+
 logger = logging.getLogger(__name__)
 
+# Counter field -> emitted rate metric suffix
+DISK_RATE_METRICS = {
+    'read_bytes': 'read_bytes_per_sec',
+    'write_bytes': 'write_bytes_per_sec',
+    'read_count': 'read_iops',
+    'write_count': 'write_iops',
+}
+NETWORK_RATE_METRICS = {
+    'bytes_sent': 'bytes_sent_per_sec',
+    'bytes_recv': 'bytes_recv_per_sec',
+    'packets_sent': 'packets_sent_per_sec',
+    'packets_recv': 'packets_recv_per_sec',
+    'errin': 'errors_in_per_sec',
+    'errout': 'errors_out_per_sec',
+    'dropin': 'drops_in_per_sec',
+    'dropout': 'drops_out_per_sec',
+}
+
+# Key of the machine-wide counters, tracked alongside the per-device ones
+_TOTAL = '*'
+
+
 class SystemMonitor:
     """Monitors system resources and performance metrics"""
     
     def __init__(self, config):
         self.config = config
         self.process = psutil.Process()
-        logger.info("System monitor initialized")
+        self.procfs = self._create_procfs_reader(config.SYSTEM_COLLECTOR_BACKEND)
+        # (snapshot, monotonic read time) of the latest /proc/stat read, shared with the process census
+        self._stat_sample = (None, None)
+        self._cpu_max_frequency = None
+        self.cpu_sampler = CpuSampler(
+            config.CPU_SAMPLE_INTERVAL,
+            self._read_procfs_cpu_times if self.procfs else read_psutil_times
+        )
+        self.connection_states = ConnectionStateCounter(config.CONNECTION_STATS_INTERVAL)
+        self.cgroup = self._create_cgroup_monitor(config)
+        self.process_census = ProcessCensus(
+            self.procfs,
+            config.PROCESS_SCAN_INTERVAL,
+            config.PROCESS_TOP_N,
+            config.PROCESS_RANK_BY
+        )
+        self.device_exclude = re.compile(config.SYSTEM_DEVICE_EXCLUDE)
+        self.disk_rates = CounterRates(DISK_RATE_METRICS)
+        self.network_rates = CounterRates(NETWORK_RATE_METRICS)
+        logger.info(f"System monitor initialized with {'procfs' if self.procfs else 'psutil'} backend")
+        
+    @staticmethod
+    def _create_procfs_reader(backend: str):
+        """Open the /proc reader for the procfs backend; None means use psutil"""
+        if backend == 'psutil':
+            return None
+        if not procfs_available():
+            if backend == 'procfs':
+                logger.warning("procfs system backend requested but /proc is not readable, using psutil")
+            return None
+        try:
+            return ProcfsReader()
+        except OSError as e:
+            logger.warning(f"Could not open /proc files ({e}), using psutil")
+            return None
+        
+    def _read_procfs_cpu_times(self):
+        """Read /proc/stat once for the CPU sampler and keep the snapshot for the process census"""
+        stat = self.procfs.stat()
+        self._stat_sample = (stat, time.monotonic())
+        return stat.cpu, stat.per_cpu
+        
+    @staticmethod
+    def _create_cgroup_monitor(config):
+        """Monitor for the worker's own cgroup v2 group; None when disabled or not on cgroup v2"""
+        if not config.ENABLE_CGROUP_METRICS:
+            return None
+        path = find_own_cgroup()
+        if path is None:
+            logger.info("No cgroup v2 hierarchy found, container metrics disabled")
+            return None
+        return CgroupMonitor(path, config.CGROUP_INCLUDE_SIBLINGS)
         
     def get_cpu_metrics(self) -> Dict[str, float]:
         """Get CPU usage and performance metrics"""
         metrics = {}
         
         try:
-            # Overall CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            metrics['cpu_usage_percent'] = cpu_percent
+            # Overall and per-core CPU usage from cpu_times deltas
+            cpu_sample = self.cpu_sampler.sample()
+            metrics['cpu_usage_percent'] = cpu_sample['cpu_percent']
             
-            # Per-core CPU usage
-            cpu_per_core = psutil.cpu_percent(interval=1, percpu=True)
+            cpu_per_core = cpu_sample['per_core_percent']
             metrics['cpu_core_count'] = len(cpu_per_core)
             metrics['cpu_max_core_usage'] = max(cpu_per_core) if cpu_per_core else 0
             metrics['cpu_min_core_usage'] = min(cpu_per_core) if cpu_per_core else 0
             metrics['cpu_avg_core_usage'] = sum(cpu_per_core) / len(cpu_per_core) if cpu_per_core else 0
             
-            # CPU frequency
-            cpu_freq = psutil.cpu_freq()
+            # CPU frequency; the maximum is fixed, so it is only looked up once
+            cpu_freq = (self.procfs and self.procfs.cpu_freq()) or psutil.cpu_freq()
             if cpu_freq:
                 metrics['cpu_frequency_mhz'] = cpu_freq.current
-                metrics['cpu_max_frequency_mhz'] = cpu_freq.max
+                if self._cpu_max_frequency is None:
+                    self._cpu_max_frequency = cpu_freq.max
+                metrics['cpu_max_frequency_mhz'] = self._cpu_max_frequency
                 
             # Load averages (Linux/Unix)
-            try:
-                load_avg = psutil.getloadavg()
-                metrics['load_avg_1min'] = load_avg[0]
-                metrics['load_avg_5min'] = load_avg[1]
-                metrics['load_avg_15min'] = load_avg[2]
-            except AttributeError:
-                # getloadavg not available on Windows
-                pass
+            if self.procfs:
+                load_avg = self.procfs.loadavg()
+                metrics['load_avg_1min'] = load_avg.load1
+                metrics['load_avg_5min'] = load_avg.load5
+                metrics['load_avg_15min'] = load_avg.load15
+            else:
+                try:
+                    load_avg = psutil.getloadavg()
+                    metrics['load_avg_1min'] = load_avg[0]
+                    metrics['load_avg_5min'] = load_avg[1]
+                    metrics['load_avg_15min'] = load_avg[2]
+                except AttributeError:
+                    # getloadavg not available on Windows
+                    pass
                 
-            # CPU times
-            cpu_times = psutil.cpu_times()
+            # CPU times (reuse the snapshot taken by the sampler)
+            cpu_times = cpu_sample['cpu_times']
             metrics['cpu_time_user'] = cpu_times.user
             metrics['cpu_time_system'] = cpu_times.system
             metrics['cpu_time_idle'] = cpu_times.idle
@@ -66,8 +155,12 @@ class SystemMonitor:
         metrics = {}
         
         try:
+            if self.procfs:
+                vm, swap = self.procfs.memory()
+            else:
+                vm, swap = psutil.virtual_memory(), psutil.swap_memory()
+                
             # Virtual memory
-            vm = psutil.virtual_memory()
             metrics['memory_total_gb'] = vm.total / (1024**3)
             metrics['memory_used_gb'] = vm.used / (1024**3)
             metrics['memory_available_gb'] = vm.available / (1024**3)
@@ -75,7 +168,6 @@ class SystemMonitor:
             metrics['memory_free_gb'] = vm.free / (1024**3)
             
             # Swap memory
-            swap = psutil.swap_memory()
             metrics['swap_total_gb'] = swap.total / (1024**3)
             metrics['swap_used_gb'] = swap.used / (1024**3)
             metrics['swap_free_gb'] = swap.free / (1024**3)
@@ -85,7 +177,8 @@ class SystemMonitor:
             process_memory = self.process.memory_info()
             metrics['process_memory_rss_mb'] = process_memory.rss / (1024**2)
             metrics['process_memory_vms_mb'] = process_memory.vms / (1024**2)
-            metrics['process_memory_percent'] = self.process.memory_percent()
+            # Same as Process.memory_percent() without re-reading system memory
+            metrics['process_memory_percent'] = process_memory.rss / vm.total * 100 if vm.total else 0
             
         except Exception as e:
             logger.error(f"Error getting memory metrics: {e}")
@@ -105,7 +198,10 @@ class SystemMonitor:
             metrics['disk_usage_percent'] = (disk_usage.used / disk_usage.total) * 100
             
             # Disk I/O
-            disk_io = psutil.disk_io_counters()
+            if self.procfs:
+                disk_io, per_disk = self.procfs.disk_io_counters()
+            else:
+                disk_io, per_disk = psutil.disk_io_counters(), psutil.disk_io_counters(perdisk=True)
             if disk_io:
                 metrics['disk_read_bytes'] = disk_io.read_bytes
                 metrics['disk_write_bytes'] = disk_io.write_bytes
@@ -114,18 +210,43 @@ class SystemMonitor:
                 metrics['disk_read_time_ms'] = disk_io.read_time
                 metrics['disk_write_time_ms'] = disk_io.write_time
                 
+                # Rates since the previous collection, machine-wide and per block device
+                per_disk = self._included_devices(per_disk)
+                per_disk[_TOTAL] = disk_io
+                metrics.update(self._rate_metrics('disk', self.disk_rates.update(per_disk), DISK_RATE_METRICS))
+                
         except Exception as e:
             logger.error(f"Error getting disk metrics: {e}")
             
         return metrics
         
+    def _included_devices(self, counters: Dict[str, object]) -> Dict[str, object]:
+        """Drop loopback, loop and ramdisk devices (SYSTEM_DEVICE_EXCLUDE)"""
+        return {
+            device: values for device, values in (counters or {}).items()
+            if not self.device_exclude.match(device)
+        }
+        
+    def _rate_metrics(self, family: str, rates: Dict[str, Dict[str, float]],
+                      names: Dict[str, str]) -> Dict[str, float]:
+        """Name rates as {family}_{metric} for the totals and {family}.{device}.{metric} per device"""
+        metrics = {}
+        for device, device_rates in rates.items():
+            prefix = f"{family}_" if device == _TOTAL else f"{family}.{device}."
+            for field, rate in device_rates.items():
+                metrics[prefix + names[field]] = rate
+        return metrics
+        
     def get_network_interface_metrics(self) -> Dict[str, float]:
         """Get network interface statistics"""
         metrics = {}
         
         try:
             # Network I/O
-            net_io = psutil.net_io_counters()
+            if self.procfs:
+                net_io, per_nic = self.procfs.net_io_counters()
+            else:
+                net_io, per_nic = psutil.net_io_counters(), psutil.net_io_counters(pernic=True)
             if net_io:
                 metrics['network_bytes_sent'] = net_io.bytes_sent
                 metrics['network_bytes_recv'] = net_io.bytes_recv
@@ -136,16 +257,17 @@ class SystemMonitor:
                 metrics['network_drops_in'] = net_io.dropin
                 metrics['network_drops_out'] = net_io.dropout
                 
-            # Network connections count
-            connections = psutil.net_connections()
-            connection_states = {}
-            for conn in connections:
-                state = conn.status
-                connection_states[state] = connection_states.get(state, 0) + 1
+                # Rates since the previous collection, machine-wide and per interface
+                per_nic = self._included_devices(per_nic)
+                per_nic[_TOTAL] = net_io
+                metrics.update(self._rate_metrics('network', self.network_rates.update(per_nic), NETWORK_RATE_METRICS))
                 
-            metrics['network_connections_total'] = len(connections)
+            # Network connections count per state, from /proc/net when available
+            connection_states = self.connection_states.get_states()
+            metrics['network_connections_total'] = sum(connection_states.values())
             for state, count in connection_states.items():
                 metrics[f'network_connections_{state.lower()}'] = count
+            metrics['network_connections_refresh_ms'] = self.connection_states.last_refresh_ms
                 
         except Exception as e:
             logger.error(f"Error getting network metrics: {e}")
@@ -188,13 +310,13 @@ class SystemMonitor:
         
         try:
             # System uptime
-            boot_time = psutil.boot_time()
+            boot_time = self.procfs.boot_time() if self.procfs else psutil.boot_time()
             uptime_seconds = psutil.time.time() - boot_time
             metrics['system_uptime_seconds'] = uptime_seconds
             metrics['system_uptime_hours'] = uptime_seconds / 3600
             
-            # Number of processes
-            metrics['system_process_count'] = len(psutil.pids())
+            # Process and task counts, plus the periodic top-N process scan
+            metrics.update(self.process_census.get_metrics(*self._stat_sample))
             
             # System users
             users = psutil.users()
@@ -205,6 +327,17 @@ class SystemMonitor:
             
         return metrics
         
+    def get_cgroup_metrics(self) -> Dict[str, float]:
+        """Get container CPU, memory, I/O and pressure metrics from cgroup v2"""
+        if self.cgroup is None:
+            return {}
+            
+        try:
+            return self.cgroup.get_metrics()
+        except Exception as e:
+            logger.error(f"Error getting cgroup metrics: {e}")
+            return {}
+        
     def simulate_application_metrics(self) -> Dict[str, float]:
         """Simulate application-specific metrics"""
         metrics = {}
@@ -235,6 +368,7 @@ class SystemMonitor:
         network_metrics = self.get_network_interface_metrics()
         process_metrics = self.get_process_metrics()
         system_metrics = self.get_system_info_metrics()
+        cgroup_metrics = self.get_cgroup_metrics()
         app_metrics = self.simulate_application_metrics()
         
         # Combine all metrics
@@ -244,14 +378,25 @@ class SystemMonitor:
         all_metrics.update(network_metrics)
         all_metrics.update(process_metrics)
         all_metrics.update(system_metrics)
+        all_metrics.update(cgroup_metrics)
         all_metrics.update(app_metrics)
         
-        # Calculate overall system health score
-        cpu_score = max(0, 100 - all_metrics.get('cpu_usage_percent', 0))
-        memory_score = max(0, 100 - all_metrics.get('memory_usage_percent', 0))
+        # Calculate overall system health score, against the container's limits when known
+        cpu_usage = all_metrics.get('cgroup_cpu_usage_percent', all_metrics.get('cpu_usage_percent', 0))
+        memory_usage = all_metrics.get('cgroup_memory_usage_percent', all_metrics.get('memory_usage_percent', 0))
+        cpu_score = max(0, 100 - cpu_usage)
+        memory_score = max(0, 100 - memory_usage)
         disk_score = max(0, 100 - all_metrics.get('disk_usage_percent', 0))
         
         system_health = (cpu_score + memory_score + disk_score) / 3
         all_metrics['system_health_score'] = system_health
         
         return all_metrics
+        
+    def stop(self):
+        """Release background resources held by the monitor"""
+        self.cpu_sampler.stop(timeout=1)
+        if self.procfs:
+            self.procfs.close()
+        if self.cgroup:
+            self.cgroup.close()
@@ -0,0 +1,294 @@
+"""
+Metric sinks
+Output backends for telemetry snapshots and events (New Relic, JSON lines, Prometheus, OTLP/HTTP)
+"""
+
+import os
+import re
+import json
+import time
+import logging
+from typing import AbstractSet, Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# {family: {metric name: value}}
+Snapshot = Dict[str, Dict[str, float]]
+
+_PROMETHEUS_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_:]')
+
+# Cumulative counters, by metric name within their family; every other metric is a gauge.
+# Several per-cycle simulator counts end in _total too, so the suffix alone is not enough.
+COUNTER_METRICS = frozenset({
+    # worker
+    'emission_queue_enqueued_total', 'emission_queue_emitted_total', 'emission_queue_dropped_total',
+    'emission_queue_failed_total', 'log_records_dropped_total', 'scheduler_cycles_total',
+    'scheduler_overruns_total', 'scheduler_skipped_ticks_total',
+    # system
+    'cpu_time_user', 'cpu_time_system', 'cpu_time_idle',
+    'disk_read_bytes', 'disk_write_bytes', 'disk_read_count', 'disk_write_count',
+    'disk_read_time_ms', 'disk_write_time_ms',
+    'network_bytes_sent', 'network_bytes_recv', 'network_packets_sent', 'network_packets_recv',
+    'network_errors_in', 'network_errors_out', 'network_drops_in', 'network_drops_out',
+    'cgroup_cpu_throttled_periods_total',
+})
+
+
+def flatten_snapshot(snapshot: Snapshot, prefixes: Dict[str, str]):
+    """Yield (prefixed metric name, value) pairs for a snapshot"""
+    for family, metrics in snapshot.items():
+        prefix = prefixes.get(family, f"{family}.")
+        for metric_name, value in metrics.items():
+            yield prefix + metric_name, value
+
+
+class MetricSink:
+    """Base class for metric sinks
+
+    ``prefixes`` maps each snapshot family to the dotted prefix used for its
+    metric names, e.g. ``{'kubernetes': 'k8s.'}``.
+    """
+
+    name = 'base'
+
+    def __init__(self, config, prefixes: Dict[str, str]):
+        self.config = config
+        self.prefixes = prefixes
+
+    def send_metrics(self, snapshot: Snapshot):
+        """Emit a whole metric snapshot"""
+        raise NotImplementedError
+
+    def send_event(self, event_type: str, attributes: Dict[str, Any]):
+        """Emit a custom event; sinks without event support ignore it"""
+
+    def close(self):
+        """Flush and release sink resources"""
+
+    def flatten(self, snapshot: Snapshot):
+        """Yield (prefixed metric name, value) pairs for a snapshot"""
+        return flatten_snapshot(snapshot, self.prefixes)
+
+
+class NewRelicSink(MetricSink):
+    """Sends metrics and events through the New Relic Python agent"""
+
+    name = 'newrelic'
+
+    def __init__(self, config, prefixes: Dict[str, str]):
+        super().__init__(config, prefixes)
+
+        # Imported here so deployments without this sink never load the agent
+        import newrelic.agent
+        from newrelic.api.application import application_instance
+
+        self.agent = newrelic.agent
+        self.agent.initialize('newrelic.ini')
+        self.app = application_instance()
+        logger.info("New Relic agent initialized")
+
+    def send_metrics(self, snapshot: Snapshot):
+        self.agent.record_custom_metrics(self.flatten(snapshot))
+        logger.debug(f"Sent {len(snapshot)} metric families to New Relic")
+
+    def send_event(self, event_type: str, attributes: Dict[str, Any]):
+        self.agent.record_custom_event(event_type, attributes)
+        logger.debug(f"Sent event to New Relic: {event_type}")
+
+
+class JsonLinesSink(MetricSink):
+    """Appends snapshots and events to a JSON-lines file"""
+
+    name = 'jsonl'
+
+    def __init__(self, config, prefixes: Dict[str, str]):
+        super().__init__(config, prefixes)
+        self.path = config.METRIC_JSONL_PATH
+        self.file = open(self.path, 'a', encoding='utf-8')
+        logger.info(f"Writing metrics to JSON lines file {self.path}")
+
+    def _write(self, record: Dict[str, Any]):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def send_metrics(self, snapshot: Snapshot):
+        self._write({
+            'timestamp': time.time(),
+            'type': 'metrics',
+            'metrics': dict(self.flatten(snapshot))
+        })
+
+    def send_event(self, event_type: str, attributes: Dict[str, Any]):
+        self._write({
+            'timestamp': time.time(),
+            'type': 'event',
+            'event_type': event_type,
+            'attributes': attributes
+        })
+
+    def close(self):
+        self.file.close()
+
+
+def prometheus_metric_name(name: str) -> str:
+    """Convert a dotted metric name into a valid Prometheus metric name"""
+    return 'telemetry_' + _PROMETHEUS_INVALID_CHARS.sub('_', name)
+
+
+def _prometheus_value(value) -> str:
+    """Format a sample value the way the exposition format expects"""
+    value = float(value)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def render_prometheus(pairs, counters: AbstractSet[str] = frozenset()) -> str:
+    """Render (metric name, value) pairs in Prometheus text exposition format
+
+    Names in ``counters`` are typed as counters, everything else as gauges.
+    """
+    lines = []
+    for name, value in pairs:
+        metric_name = prometheus_metric_name(name)
+        metric_type = 'counter' if name in counters else 'gauge'
+        lines.append(f"# TYPE {metric_name} {metric_type}")
+        lines.append(f"{metric_name} {_prometheus_value(value)}")
+    lines.append('')
+    return '\n'.join(lines)
+
+
+class PrometheusExposition:
+    """Latest value of every family, pre-rendered in Prometheus text format
+
+    Collectors run at different intervals, so a snapshot may hold only some
+    families. Each family is rendered to bytes only when a snapshot carries
+    it, and ``body`` is rebuilt from the cached family buffers, so reading
+    the exposition never re-renders anything.
+    """
+
+    def __init__(self, prefixes: Dict[str, str]):
+        self.prefixes = prefixes
+        self._families: Dict[str, bytes] = {}
+        self.body = b''
+
+    def update(self, snapshot: Snapshot):
+        for family, metrics in snapshot.items():
+            pairs = flatten_snapshot({family: metrics}, self.prefixes)
+            prefix = self.prefixes.get(family, f"{family}.")
+            counters = {prefix + name for name in COUNTER_METRICS.intersection(metrics)}
+            self._families[family] = render_prometheus(pairs, counters).encode('utf-8')
+        # Replaced in one assignment so concurrent readers see the old or the new body
+        self.body = b''.join(self._families.values())
+
+
+class PrometheusTextSink(MetricSink):
+    """Writes the latest value of every family as a Prometheus textfile-collector file"""
+
+    name = 'prometheus'
+
+    def __init__(self, config, prefixes: Dict[str, str]):
+        super().__init__(config, prefixes)
+        self.path = config.PROMETHEUS_TEXTFILE_PATH
+        self.exposition = PrometheusExposition(prefixes)
+        logger.info(f"Writing Prometheus exposition to {self.path}")
+
+    def send_metrics(self, snapshot: Snapshot):
+        self.exposition.update(snapshot)
+        # Write to a temporary file and rename so scrapers never see a partial file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.exposition.body)
+        os.replace(tmp_path, self.path)
+
+
+class OtlpHttpSink(MetricSink):
+    """Posts snapshots as OTLP/HTTP JSON gauges and events as OTLP log records"""
+
+    name = 'otlp'
+
+    def __init__(self, config, prefixes: Dict[str, str]):
+        super().__init__(config, prefixes)
+        self.endpoint = config.OTLP_ENDPOINT.rstrip('/')
+        self.timeout = config.OTLP_TIMEOUT
+        self.resource = {
+            'attributes': [
+                {'key': 'service.name', 'value': {'stringValue': config.NEW_RELIC_APP_NAME}},
+                {'key': 'service.instance.id', 'value': {'stringValue': config.WORKER_ID}},
+                {'key': 'deployment.environment', 'value': {'stringValue': config.ENVIRONMENT}},
+            ]
+        }
+        logger.info(f"Sending OTLP/HTTP telemetry to {self.endpoint}")
+
+    def _post(self, path: str, payload: Dict[str, Any]):
+        import urllib.request  # deferred: only this sink needs the HTTP client stack
+
+        request = urllib.request.Request(
+            f"{self.endpoint}{path}",
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def send_metrics(self, snapshot: Snapshot):
+        now_nanos = str(time.time_ns())
+        metrics = [
+            {'name': name, 'gauge': {'dataPoints': [{'asDouble': float(value), 'timeUnixNano': now_nanos}]}}
+            for name, value in self.flatten(snapshot)
+        ]
+        self._post('/v1/metrics', {
+            'resourceMetrics': [{
+                'resource': self.resource,
+                'scopeMetrics': [{'scope': {'name': 'telemetry_worker'}, 'metrics': metrics}]
+            }]
+        })
+
+    def send_event(self, event_type: str, attributes: Dict[str, Any]):
+        record = {
+            'timeUnixNano': str(time.time_ns()),
+            'body': {'stringValue': event_type},
+            'attributes': [
+                {'key': key, 'value': {'stringValue': str(value)}}
+                for key, value in attributes.items()
+            ]
+        }
+        self._post('/v1/logs', {
+            'resourceLogs': [{
+                'resource': self.resource,
+                'scopeLogs': [{'scope': {'name': 'telemetry_worker'}, 'logRecords': [record]}]
+            }]
+        })
+
+
+SINKS = {
+    'newrelic': NewRelicSink,
+    'jsonl': JsonLinesSink,
+    'prometheus': PrometheusTextSink,
+    'otlp': OtlpHttpSink,
+}
+
+
+def create_sinks(config, prefixes: Dict[str, str]) -> List[MetricSink]:
+    """Create the sinks listed in config.METRIC_SINKS
+
+    A sink that cannot be set up (e.g. New Relic without a license key or
+    agent) is skipped with a warning instead of stopping the worker.
+    """
+    sinks = []
+    for sink_name in config.METRIC_SINKS:
+        if sink_name == 'newrelic' and not config.NEW_RELIC_ENABLED:
+            logger.warning("New Relic agent not initialized")
+            continue
+
+        try:
+            sinks.append(SINKS[sink_name](config, prefixes))
+        except ImportError:
+            logger.warning(f"Dependencies for {sink_name} sink not available, sink disabled")
+        except Exception as e:
+            logger.error(f"Failed to initialize {sink_name} sink: {e}")
+
+    return sinks
@@ -5,82 +5,85 @@ Main telemetry worker that orchestrates all simulation components
 import time
 import threading
 import logging
-import json
-import random
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-# Import New Relic components
-try:
-    import newrelic.agent
-    from newrelic.api.application import application_instance
-    from newrelic.api.transaction import current_transaction
-except ImportError:
-    logging.warning("New Relic agent not available. Install with: pip install newrelic")
-    newrelic = None
-
-from simulators.kubernetes_simulator import KubernetesSimulator
-from simulators.database_simulator import DatabaseSimulator
-from simulators.storage_simulator import StorageSimulator
-from simulators.network_simulator import NetworkSimulator
-from simulators.system_monitor import SystemMonitor
+from collector_executor import create_collector_executor
+from collectors import load_collector_specs, metric_prefixes
+from emission_queue import EmissionQueue
+from log_pipeline import StructuredMessage
+from scheduler import CycleScheduler
+from sinks import PrometheusExposition, create_sinks
 
 logger = logging.getLogger(__name__)
 
 class TelemetryWorker:
     """Main worker class that coordinates all telemetry simulation"""
     
-    def __init__(self, config):
+    def __init__(self, config, log_pipeline=None):
         self.config = config
+        self.log_pipeline = log_pipeline
         self.running = False
         
-        # Initialize New Relic if available
-        if newrelic and config.NEW_RELIC_ENABLED:
-            newrelic.agent.initialize('newrelic.ini')
-            self.app = application_instance()
-            logger.info("New Relic agent initialized")
-        else:
-            self.app = None
-            logger.warning("New Relic agent not initialized")
-        
-        # Initialize simulators
-        self.k8s_simulator = KubernetesSimulator(config)
-        self.db_simulator = DatabaseSimulator(config)
-        self.storage_simulator = StorageSimulator(config)
-        self.network_simulator = NetworkSimulator(config)
-        self.system_monitor = SystemMonitor(config)
-        
-        logger.info("All simulators initialized successfully")
-        
-    def send_metric_to_newrelic(self, metric_name: str, value: float, metric_type: str = "gauge", unit: str = None):
-        """Send custom metric to New Relic"""
-        if not self.app:
-            return
-            
-        try:
-            # Send custom metric
-            newrelic.agent.record_custom_metric(metric_name, value)
-            
-            # Log the metric for debugging
-            logger.debug(f"Sent metric to New Relic: {metric_name} = {value}")
-            
-        except Exception as e:
-            logger.error(f"Failed to send metric to New Relic: {e}")
+        # Monotonic time of the last cycle with at least one successful collector, read by the health server
+        self.last_success_time: Optional[float] = None
+        
+        # Metric name prefixes per snapshot family, built once
+        self.metric_prefixes = metric_prefixes()
+        
+        # Latest metrics of every family, pre-rendered once per cycle for /metrics scrapes
+        self.exposition = PrometheusExposition(self.metric_prefixes) if config.HEALTH_PORT else None
+        
+        # Output sinks selected in config (New Relic, JSON lines, Prometheus, OTLP)
+        self.sinks = create_sinks(config, self.metric_prefixes)
+        logger.info(f"Metric sinks enabled: {', '.join(sink.name for sink in self.sinks) or 'none'}")
+        
+        # Sink and log I/O happen on the emitter thread, off the collection path
+        self.emission_queue = EmissionQueue(
+            config.EMISSION_QUEUE_SIZE,
+            config.EMISSION_QUEUE_POLICY,
+            config.EMISSION_QUEUE_BLOCK_TIMEOUT
+        )
+        
+        # Import and initialize only the enabled simulators, behind the configured executor
+        self.collector_import_ms: Dict[str, float] = {}
+        specs = load_collector_specs(config, self.collector_import_ms)
+        self.executor = create_collector_executor(
+            config.COLLECTOR_EXECUTOR,
+            specs,
+            config,
+            config.COLLECTOR_TIMEOUT
+        )
+        
+        logger.info(f"Simulators initialized: {', '.join(name for name, _, _ in specs) or 'none'}")
+        
+        # Each collector runs at its own interval
+        collector_config = config.get_collector_config()
+        self.scheduler = CycleScheduler({
+            name: collector_config[name]['interval'] for name, _, _ in specs
+        })
+        
+    def send_metrics_batch(self, snapshot: Dict[str, Dict[str, float]]):
+        """Send a whole {family: {name: value}} snapshot to every sink"""
+        for sink in self.sinks:
+            try:
+                sink.send_metrics(snapshot)
+            except Exception as e:
+                logger.error(f"Failed to send metrics to {sink.name} sink: {e}")
+                
+    def send_event(self, event_type: str, attributes: Dict[str, Any]):
+        """Send custom event to every sink"""
+        for sink in self.sinks:
+            try:
+                sink.send_event(event_type, attributes)
+            except Exception as e:
+                logger.error(f"Failed to send event to {sink.name} sink: {e}")
             
-    def send_event_to_newrelic(self, event_type: str, attributes: Dict[str, Any]):
-        """Send custom event to New Relic"""
-        if not self.app:
+    def log_structured_event(self, event_type: str, data: Dict[str, Any]):
+        """Log structured JSON event, encoded only when a handler writes it"""
+        if not logger.isEnabledFor(logging.INFO):
             return
             
-        try:
-            newrelic.agent.record_custom_event(event_type, attributes)
-            logger.debug(f"Sent event to New Relic: {event_type}")
-            
-        except Exception as e:
-            logger.error(f"Failed to send event to New Relic: {e}")
-            
-    def log_structured_event(self, event_type: str, data: Dict[str, Any]):
-        """Log structured JSON event"""
         log_entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "event_type": event_type,
@@ -88,61 +91,75 @@ class TelemetryWorker:
             "data": data
         }
         
-        logger.info(json.dumps(log_entry))
+        logger.info(StructuredMessage(log_entry))
+        
+    def emit_cycle(self, snapshot: Dict[str, Dict[str, float]], cycle_event: Dict[str, Any]):
+        """Emit one cycle's snapshot, structured log entry and cycle event"""
+        self.send_metrics_batch(snapshot)
+        self.log_structured_event("telemetry_cycle", {
+            family: metrics for family, metrics in snapshot.items() if family != 'worker'
+        })
+        self.send_event("TelemetryCycle", cycle_event)
+        
+    def report_startup(self, startup_metrics: Dict[str, float]):
+        """Emit startup timings once, as worker metrics and a TelemetryStartup event"""
+        metrics = dict(startup_metrics)
+        for name, duration_ms in self.collector_import_ms.items():
+            metrics[f'startup_import_{name}_ms'] = duration_ms
+        self.emission_queue.put(self.send_metrics_batch, {'worker': metrics})
+        self.emission_queue.put(self.send_event, "TelemetryStartup", metrics)
         
-    def run_simulation_cycle(self):
-        """Run one complete simulation cycle"""
+    def run_simulation_cycle(self, names: Optional[List[str]] = None):
+        """Run one simulation cycle for the named collectors (all by default)"""
         cycle_start = time.time()
         
         try:
-            # 1. Kubernetes operations simulation
-            k8s_metrics = self.k8s_simulator.simulate_operations()
-            for metric_name, value in k8s_metrics.items():
-                self.send_metric_to_newrelic(f"k8s.{metric_name}", value)
-            
-            # 2. Database operations simulation
-            db_metrics = self.db_simulator.simulate_operations()
-            for metric_name, value in db_metrics.items():
-                self.send_metric_to_newrelic(f"database.{metric_name}", value)
-            
-            # 3. Storage operations simulation
-            storage_metrics = self.storage_simulator.simulate_operations()
-            for metric_name, value in storage_metrics.items():
-                self.send_metric_to_newrelic(f"storage.{metric_name}", value)
-            
-            # 4. Network simulation
-            network_metrics = self.network_simulator.simulate_operations()
-            for metric_name, value in network_metrics.items():
-                self.send_metric_to_newrelic(f"network.{metric_name}", value)
-            
-            # 5. System monitoring
-            system_metrics = self.system_monitor.get_metrics()
-            for metric_name, value in system_metrics.items():
-                self.send_metric_to_newrelic(f"system.{metric_name}", value)
-            
-            # Combine all metrics for structured logging
-            all_metrics = {
-                "kubernetes": k8s_metrics,
-                "database": db_metrics,
-                "storage": storage_metrics,
-                "network": network_metrics,
-                "system": system_metrics
-            }
-            
-            self.log_structured_event("telemetry_cycle", all_metrics)
-            
-            # Send aggregated cycle event to New Relic
+            # Run the due collectors through the executor
+            results = self.executor.run(names)
+            
+            all_metrics = {}
+            collector_timings = {}
+            for name, result in results.items():
+                collector_timings[f'{name}_collect_time_ms'] = result.duration_ms
+                if not result.ok:
+                    continue
+                    
+                all_metrics[name] = result.metrics
+                    
+            # Per-collector wall time and failure counts
+            worker_metrics = dict(collector_timings)
+            worker_metrics['collectors_timed_out'] = sum(1 for r in results.values() if r.status == 'timeout')
+            worker_metrics['collectors_failed'] = sum(1 for r in results.values() if r.status == 'error')
+            worker_metrics['collectors_skipped'] = sum(1 for r in results.values() if r.status == 'skipped')
+            worker_metrics['collectors_run'] = len(results)
+            worker_metrics.update(self.emission_queue.get_metrics())
+            worker_metrics.update(self.scheduler.get_metrics())
+            if self.log_pipeline is not None:
+                worker_metrics.update(self.log_pipeline.get_metrics())
+            
+            # Aggregated cycle event
             cycle_duration = time.time() - cycle_start
-            self.send_event_to_newrelic("TelemetryCycle", {
+            cycle_event = {
                 "duration_ms": cycle_duration * 1000,
                 "metrics_collected": sum(len(m) for m in all_metrics.values())
-            })
+            }
+            cycle_event.update(collector_timings)
+            
+            # Hand off to the emitter thread so slow sinks don't extend the cycle
+            snapshot = dict(all_metrics, worker=worker_metrics)
+            self.emission_queue.put(self.emit_cycle, snapshot, cycle_event)
+            
+            if self.exposition is not None:
+                self.exposition.update(snapshot)
+            # A cycle where every collector timed out, failed or was skipped does not count toward readiness
+            if any(result.ok for result in results.values()):
+                self.last_success_time = time.monotonic()
             
             logger.info(f"Simulation cycle completed in {cycle_duration:.2f}s")
             
         except Exception as e:
             logger.error(f"Error in simulation cycle: {e}", exc_info=True)
-            self.send_event_to_newrelic("TelemetryError", {
+            self.emission_queue.put(self.send_event, "TelemetryError", {
                 "error_type": type(e).__name__,
                 "error_message": str(e)
             })
@@ -154,20 +171,22 @@ class TelemetryWorker:
         
         cycle_count = 0
         
+        # Collect from every scheduled collector once at startup, then follow the aligned schedule
+        names = list(self.scheduler.intervals)
+        
         while self.running:
             try:
                 cycle_count += 1
                 logger.debug(f"Starting simulation cycle #{cycle_count}")
                 
-                self.run_simulation_cycle()
-                
-                # Random jitter to simulate realistic variance
-                base_interval = self.config.MONITORING_INTERVAL
-                jitter = random.uniform(-0.1, 0.1) * base_interval
-                sleep_time = max(1, base_interval + jitter)
-                
-                time.sleep(sleep_time)
+                self.run_simulation_cycle(names)
                 
+                if cycle_count == 1:
+                    self.scheduler.start()
+                names = self.scheduler.wait()
+                if names is None:
+                    break
+                    
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal")
                 break
@@ -180,4 +199,10 @@ class TelemetryWorker:
     def stop(self):
         """Stop the telemetry worker"""
         self.running = False
+        self.scheduler.stop()
+        self.executor.shutdown()
+        # Sinks are only closed once the emitter thread can no longer write to them
+        if self.emission_queue.close(timeout=5):
+            for sink in self.sinks:
+                sink.close()
         logger.info("Telemetry worker stop requested")
@@ -0,0 +1,73 @@
+"""Tests for the database simulator"""
+
+import pytest
+
+from config import Config
+from simulators.database_simulator import DatabaseSimulator, QueryTypeStats
+from simulators.sampling import np
+
+ENGINES = ['python', pytest.param('numpy', marks=pytest.mark.skipif(np is None, reason='NumPy not installed'))]
+
+
+def _simulator(engine: str, queries_per_cycle: int = 0) -> DatabaseSimulator:
+    config = Config()
+    config.SIMULATION_ENGINE = engine
+    config.DB_QUERIES_PER_CYCLE = queries_per_cycle
+    return DatabaseSimulator(config)
+
+
+def test_per_type_average_and_cumulative_buckets():
+    simulator = _simulator('python')
+    stats = [QueryTypeStats() for _ in simulator.query_metrics]
+    select = stats[0]
+    for exec_time in (3, 10, 12, 600, 3000):
+        select.add(exec_time, slow=exec_time > 500)
+
+    metrics = simulator._query_performance_metrics(stats, [3, 10, 12, 600, 3000])
+
+    assert metrics['select_count'] == 5
+    assert metrics['select_avg_time_ms'] == pytest.approx(725)
+    # Buckets are cumulative and inclusive of their upper bound
+    assert [metrics[f'select_latency_le_{bound}_ms'] for bound in (5, 10, 25, 50, 100, 250, 500, 1000, 2500)] \
+        == [1, 2, 3, 3, 3, 3, 3, 4, 4]
+    assert metrics['insert_count'] == 0
+    assert metrics['insert_avg_time_ms'] == 0
+    assert metrics['slow_queries_count'] == 2
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engines_bucket_fixed_latencies_alike(engine):
+    simulator = _simulator(engine, queries_per_cycle=200)
+    # Fixed latencies: SELECT sits exactly on the 10ms bound, JOIN between 25 and 50ms
+    simulator.query_metrics = {
+        'SELECT': {'min': 10, 'max': 10, 'weight': 0.5},
+        'JOIN': {'min': 30, 'max': 30, 'weight': 0.5},
+    }
+    simulator.slow_query_probability = 0
+    if engine == 'numpy':
+        simulator._query_weights = np.array([0.5, 0.5])
+        simulator._query_min = np.array([10.0, 30.0])
+        simulator._query_max = np.array([10.0, 30.0])
+
+    metrics = simulator.simulate_query_performance()
+
+    select, join = metrics['select_count'], metrics['join_count']
+    assert select > 0 and join > 0
+    assert metrics['select_avg_time_ms'] == pytest.approx(10)
+    assert metrics['join_avg_time_ms'] == pytest.approx(30)
+    assert metrics['select_latency_le_5_ms'] == 0
+    assert metrics['select_latency_le_10_ms'] == select
+    assert metrics['join_latency_le_25_ms'] == 0
+    assert metrics['join_latency_le_50_ms'] == join
+    assert metrics['join_latency_le_2500_ms'] == join
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('queries_per_cycle', [1, 7, 99, 1000])
+def test_query_counts_sum_to_queries_per_cycle(engine, queries_per_cycle):
+    simulator = _simulator(engine, queries_per_cycle)
+
+    counts = simulator._query_counts()
+
+    assert sum(counts) == queries_per_cycle
+    assert simulator.simulate_query_performance()['total_queries'] == queries_per_cycle
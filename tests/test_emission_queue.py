@@ -0,0 +1,26 @@
+"""Tests for the bounded emission queue"""
+
+import threading
+
+from emission_queue import EmissionQueue
+
+
+def test_put_after_close_is_dropped_and_counted():
+    emitted = []
+    emission_queue = EmissionQueue(maxsize=4)
+    assert emission_queue.put(emitted.append, 1)
+    assert emission_queue.close(timeout=5)
+
+    assert not emission_queue.put(emitted.append, 2)
+    assert emitted == [1]
+    assert emission_queue.get_metrics()['emission_queue_dropped_total'] == 1
+
+
+def test_close_reports_a_stuck_emitter():
+    release = threading.Event()
+    emission_queue = EmissionQueue(maxsize=4)
+    emission_queue.put(release.wait)
+
+    assert not emission_queue.close(timeout=0.1)
+    release.set()
+    assert emission_queue.close(timeout=5)
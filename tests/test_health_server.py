@@ -0,0 +1,64 @@
+"""Tests for worker readiness reporting"""
+
+import time
+
+from collector_executor import CollectorExecutor, CollectorResult
+from config import Config
+from health_server import HealthServer
+from telemetry_worker import TelemetryWorker
+
+
+class TimingOutExecutor(CollectorExecutor):
+    """Executor whose collectors all time out"""
+
+    def run(self, names=None):
+        return {
+            name: CollectorResult(name, None, self.timeout * 1000, 'timeout')
+            for name in (self.names if names is None else names)
+        }
+
+
+def _worker() -> TelemetryWorker:
+    config = Config()
+    config.METRIC_SINKS = []
+    config.HEALTH_PORT = 0
+    return TelemetryWorker(config)
+
+
+def test_readiness_fails_when_all_collectors_time_out():
+    worker = _worker()
+    try:
+        # Release the real executor's pool before replacing it
+        worker.executor.shutdown()
+        worker.executor = TimingOutExecutor(worker.executor.specs, worker.config, 0.01)
+        worker.running = True
+        health = HealthServer(worker, '127.0.0.1', 0, max_cycle_age=60)
+        try:
+            worker.run_simulation_cycle()
+            assert worker.last_success_time is None
+            assert health.readiness()[0] == 503
+
+            # A previously ready worker goes stale once its collectors keep hanging
+            worker.last_success_time = time.monotonic() - 120
+            worker.run_simulation_cycle()
+            status, body = health.readiness()
+            assert status == 503
+            assert body['status'] == 'stale'
+        finally:
+            health.httpd.server_close()
+    finally:
+        worker.stop()
+
+
+def test_readiness_ok_after_successful_cycle():
+    worker = _worker()
+    try:
+        worker.running = True
+        health = HealthServer(worker, '127.0.0.1', 0, max_cycle_age=60)
+        try:
+            worker.run_simulation_cycle()
+            assert health.readiness()[0] == 200
+        finally:
+            health.httpd.server_close()
+    finally:
+        worker.stop()
@@ -0,0 +1,74 @@
+"""Tests for the Kubernetes simulator"""
+
+import time
+import logging
+
+import pytest
+
+from config import Config
+from simulators.kubernetes_simulator import KubernetesSimulator
+from simulators.pod_table import STATE_RUNNING, STATE_TERMINATED
+from simulators.sampling import np
+
+ENGINES = ['python', pytest.param('numpy', marks=pytest.mark.skipif(np is None, reason='NumPy not installed'))]
+
+
+def _desired_pods(simulator) -> int:
+    """Pods not scaled down; evicted pods still count until their replacement starts"""
+    return len(simulator.pods) - simulator.pods.count(STATE_TERMINATED)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_pod_count_stays_stable_across_node_failures(engine, monkeypatch):
+    clock = [1_800_000_000.0]
+    monkeypatch.setattr(time, 'time', lambda: clock[0])
+    logging.disable(logging.CRITICAL)
+    try:
+        config = Config()
+        config.K8S_SCALE_PROFILE = 'small'
+        config.SIMULATION_ENGINE = engine
+        simulator = KubernetesSimulator(config)
+        initial = _desired_pods(simulator)
+
+        evicted = 0
+        for _ in range(300):
+            metrics = simulator.simulate_operations()
+            evicted += metrics['pods_evicted_by_node_failure']
+            clock[0] += 30
+
+            # Evicted pods are replaced, so churn aside the cluster keeps its size
+            assert abs(_desired_pods(simulator) - initial) <= initial * 0.02
+            assert simulator.pods.count(STATE_RUNNING) >= initial * 0.85
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert evicted > 0
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_workload_breakdown_stays_within_series_budget(engine):
+    config = Config()
+    config.K8S_SCALE_PROFILE = 'small'
+    config.K8S_NAMESPACES = 20
+    config.SIMULATION_ENGINE = engine
+    config.K8S_NAMESPACE_METRICS = True
+    config.K8S_POD_METRICS = True
+    config.K8S_POD_METRICS_TOP_K = 10
+    config.K8S_SERIES_BUDGET = 60
+    simulator = KubernetesSimulator(config)
+    for row in range(len(simulator.pods)):
+        simulator.pods.restarts[row] = 2
+
+    metrics = simulator.simulate_workload_breakdown()
+
+    # Rollups included, every breakdown series is charged to the budget
+    series = [name for name in metrics if name.startswith(('namespace.', 'pod.'))]
+    assert len(series) == metrics['breakdown_series_emitted'] <= config.K8S_SERIES_BUDGET
+    assert 'namespace.other.pods' in metrics
+
+    # The pod rollup covers the running pods outside the top-K
+    running = simulator.pods.rows_in_state(STATE_RUNNING)
+    top_restarts = sum(value for name, value in metrics.items()
+                       if name.startswith('pod.') and name.endswith('.restarts'))
+    assert metrics['pod.other.pods'] + sum(name.endswith('.restarts') for name in series) == len(running)
+    assert metrics['pod.other.restarts_total'] + top_restarts == 2 * len(running)
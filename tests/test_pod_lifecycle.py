@@ -0,0 +1,72 @@
+"""Tests for the pod lifecycle timer queue"""
+
+import time
+
+from config import Config
+from simulators.kubernetes_simulator import KubernetesSimulator
+from simulators.pod_lifecycle import PodLifecycle
+from simulators.pod_table import PodTable, STATE_FAILED, STATE_PENDING, STATE_RUNNING
+
+
+def test_evicted_pod_is_replaced_and_runs_again():
+    pods = PodTable(['default'])
+    row = pods.add('api-0', 'default', STATE_RUNNING, restarts=3, node=0)
+    lifecycle = PodLifecycle(pods, pick_node=lambda: 1)
+
+    lifecycle.pods_evicted([row], now=0)
+    assert pods.state[row] == STATE_FAILED
+
+    transitions = lifecycle.advance(now=10)
+    assert transitions == {'Pending': 1}
+    assert pods.state[row] == STATE_PENDING
+    assert pods.restarts[row] == 0
+    assert pods.node[row] == 1
+
+    # Pending -> ContainerCreating -> Running within the scheduling and start delays
+    lifecycle.advance(now=20)
+    lifecycle.advance(now=50)
+    assert pods.state[row] == STATE_RUNNING
+    assert len(lifecycle) == 0
+
+
+def test_replacement_skipped_when_pod_left_failed_state():
+    pods = PodTable(['default'])
+    row = pods.add('api-0', 'default', STATE_RUNNING, node=0)
+    lifecycle = PodLifecycle(pods)
+
+    lifecycle.pods_evicted([row], now=0)
+    pods.collect_garbage(0, now=1)
+
+    assert lifecycle.advance(now=10) == {}
+    assert len(pods) == 0
+
+
+def test_garbage_collection_keeps_failed_pods_awaiting_replacement():
+    pods = PodTable(['default'])
+    rows = [pods.add(f'api-{i}', 'default', STATE_RUNNING, node=0) for i in range(3)]
+    lifecycle = PodLifecycle(pods)
+
+    lifecycle.pods_evicted(rows[:2], now=0)
+    # TTL 0 is what the pod cap forces; the queued replacements must survive it
+    assert pods.collect_garbage(0, now=0.5, keep=lifecycle.pending_replacements) == 0
+    assert len(pods) == 3
+
+    assert lifecycle.advance(now=10) == {'Pending': 2}
+    assert lifecycle.pending_replacements == set()
+
+
+def test_simulator_replaces_evicted_pods_with_zero_ttl_at_the_cap():
+    config = Config()
+    config.K8S_TERMINATED_POD_TTL = 0
+    simulator = KubernetesSimulator(config)
+    simulator.max_pods = len(simulator.pods)
+    initial = len(simulator.pods)
+
+    running = simulator.pods.rows_in_state(STATE_RUNNING)[:5]
+    simulator.lifecycle.pods_evicted(running)
+    simulator.simulate_pod_scheduling()
+    assert simulator.pods.count(STATE_FAILED) == 5
+
+    simulator.lifecycle.advance(now=time.time() + 10)
+    assert simulator.pods.count(STATE_FAILED) == 0
+    assert len(simulator.pods) >= initial - 1  # scale-down may terminate one dynamic pod
@@ -0,0 +1,17 @@
+"""Tests for the metric sinks"""
+
+from sinks import PrometheusExposition
+
+
+def test_prometheus_types_cumulative_counters_as_counter():
+    exposition = PrometheusExposition({'worker': 'worker.', 'kubernetes': 'k8s.'})
+    exposition.update({
+        'worker': {'scheduler_cycles_total': 12, 'emission_queue_depth': 3},
+        # Per-cycle count that happens to end in _total stays a gauge
+        'kubernetes': {'pods_scheduled_total': 4},
+    })
+
+    body = exposition.body.decode()
+    assert '# TYPE telemetry_worker_scheduler_cycles_total counter\n' in body
+    assert '# TYPE telemetry_worker_emission_queue_depth gauge\n' in body
+    assert '# TYPE telemetry_k8s_pods_scheduled_total gauge\n' in body